@@ -3,6 +3,7 @@
 from flask import (
     Blueprint,
     Response,
+    abort,
     make_response,
     redirect,
     request,
@@ -10,8 +11,11 @@ from flask import (
     url_for,
 )
 from flask_babel import gettext as _
+from flask_wtf.csrf import generate_csrf
 
 from app.extensions import generate_robots_txt, generate_sitemap_xml
+from config import Config
+from utils.cache_stats import read_stats, render_prometheus
 from utils.toast_notify import add_toast
 
 bp = Blueprint("app_views", __name__, template_folder="templates")
@@ -50,6 +54,34 @@ def robots_txt():
     return Response(robots_content, mimetype="text/plain")
 
 
+@bp.route("/csrf-token")
+def csrf_token():
+    """Serve a CSRF token to pages rendered for a shared (CDN) cache."""
+    response = make_response({"csrf_token": generate_csrf()})
+    response.cache_control.no_store = True
+    return response
+
+
+@bp.route("/metrics")
+def metrics():
+    """
+    Serve the cache telemetry in the Prometheus text format.
+
+    Open to logged in users, and to scrapers sending `METRICS_TOKEN` as a
+    bearer token.
+    """
+    token = Config.METRICS_TOKEN
+    authorized = "user" in session or (
+        token and request.headers.get("Authorization") == f"Bearer {token}"
+    )
+    if not authorized:
+        abort(404)
+    return Response(
+        render_prometheus(read_stats()),
+        mimetype="text/plain; version=0.0.4",
+    )
+
+
 @bp.before_request
 def restrict_dashboard():
     """Restrict access to dashboard routes if not logged in."""
@@ -9,6 +9,7 @@ from app.services import (
     ResearchService,
 )
 from utils.cache_mgr import cache_response, invalidate_cache
+from utils.cdn_cache import cdn_cache
 from utils.toast_notify import add_toast
 from utils.view_modifiers import response
 
@@ -50,8 +51,9 @@ def get_knowledge_hub_data():
 
 
 @bp.route("/knowledge-hub/researches/<uuid>", methods=["GET"])
+@cdn_cache("researches", "research:{uuid}")
 @response(template_file="research-page.html")
-@cache_response()
+@cache_response(query={})
 def research_page(uuid):
     """Research page"""
     research = ResearchService().get_by_uuid(uuid)
@@ -100,14 +102,17 @@ def knowledge_hub_form():
 
 
 @bp.route("/dashboard/knowledge-hub/courses", methods=["GET"])
-@cache_response()
+@cache_response(vary=["locale"], query={"search": "", "page": 1})
 def get_courses():
     """Get courses."""
     course_service = CourseService()
     search = request.args.get("search", "")
-    courses = course_service.search_courses_by_title(search)
+    page = request.args.get("page", 1, type=int)
+    courses = course_service.search_courses_by_title(search, page)
     return render_template(
-        "partials/dashboard/knowledge_hub/courses-list.html", **courses
+        "partials/dashboard/knowledge_hub/courses-list.html",
+        **courses,
+        search=search,
     )
 
 
@@ -132,7 +137,7 @@ def create_course():
             "partials/dashboard/knowledge_hub/courses.html", **courses
         )
     )
-    invalidate_cache(["get_courses", "knowledge_hub"])
+    invalidate_cache(["get_courses", "knowledge_hub", "filter_knowledge_hub"])
     return add_toast(resp, "success", _("Course created successfully"))
 
 
@@ -159,7 +164,7 @@ def update_course(course_id):
             "partials/dashboard/knowledge_hub/courses.html", **courses
         )
     )
-    invalidate_cache(["get_courses", "knowledge_hub"])
+    invalidate_cache(["get_courses", "knowledge_hub", "filter_knowledge_hub"])
     return add_toast(resp, "success", _("Course updated successfully"))
 
 
@@ -181,19 +186,22 @@ def delete_course(course_id):
             "partials/dashboard/knowledge_hub/courses-list.html", **courses
         )
     )
-    invalidate_cache(["get_courses", "knowledge_hub"])
+    invalidate_cache(["get_courses", "knowledge_hub", "filter_knowledge_hub"])
     return add_toast(resp, "success", _("Course deleted successfully"))
 
 
 @bp.route("/dashboard/knowledge-hub/podcasts", methods=["GET"])
-@cache_response()
+@cache_response(vary=["locale"], query={"search": "", "page": 1})
 def get_podcasts():
     """Get podcasts."""
     podcast_service = PodcastService()
     search = request.args.get("search", "")
-    podcasts = podcast_service.search_podcasts_by_title(search)
+    page = request.args.get("page", 1, type=int)
+    podcasts = podcast_service.search_podcasts_by_title(search, page)
     return render_template(
-        "partials/dashboard/knowledge_hub/podcasts-list.html", **podcasts
+        "partials/dashboard/knowledge_hub/podcasts-list.html",
+        **podcasts,
+        search=search,
     )
 
 
@@ -218,7 +226,7 @@ def create_podcast():
             "partials/dashboard/knowledge_hub/podcasts.html", **podcasts
         )
     )
-    invalidate_cache(["get_podcasts", "knowledge_hub"])
+    invalidate_cache(["get_podcasts", "knowledge_hub", "filter_knowledge_hub"])
     return add_toast(resp, "success", _("Podcast created successfully"))
 
 
@@ -245,7 +253,7 @@ def update_podcast(podcast_id):
             "partials/dashboard/knowledge_hub/podcasts.html", **podcasts
         )
     )
-    invalidate_cache(["get_podcasts", "knowledge_hub"])
+    invalidate_cache(["get_podcasts", "knowledge_hub", "filter_knowledge_hub"])
     return add_toast(resp, "success", _("Podcast updated successfully"))
 
 
@@ -267,19 +275,22 @@ def delete_podcast(podcast_id):
             "partials/dashboard/knowledge_hub/podcasts-list.html", **podcasts
         )
     )
-    invalidate_cache(["get_podcasts", "knowledge_hub"])
+    invalidate_cache(["get_podcasts", "knowledge_hub", "filter_knowledge_hub"])
     return add_toast(resp, "success", _("Podcast deleted successfully"))
 
 
 @bp.route("/dashboard/knowledge-hub/researches", methods=["GET"])
-@cache_response()
+@cache_response(vary=["locale"], query={"search": "", "page": 1})
 def get_researches():
     """Get researches."""
     research_service = ResearchService()
     search = request.args.get("search", "")
-    researches = research_service.search_researches_by_title(search)
+    page = request.args.get("page", 1, type=int)
+    researches = research_service.search_researches_by_title(search, page)
     return render_template(
-        "partials/dashboard/knowledge_hub/researches-list.html", **researches
+        "partials/dashboard/knowledge_hub/researches-list.html",
+        **researches,
+        search=search,
     )
 
 
@@ -305,7 +316,14 @@ def create_research():
             "partials/dashboard/knowledge_hub/researches.html", **researches
         )
     )
-    invalidate_cache(["get_researches", "research_page", "knowledge_hub"])
+    invalidate_cache(
+        [
+            "get_researches",
+            "research_page",
+            "knowledge_hub",
+            "filter_knowledge_hub",
+        ]
+    )
     return add_toast(resp, "success", _("Research created successfully"))
 
 
@@ -333,7 +351,14 @@ def update_research(research_id):
             "partials/dashboard/knowledge_hub/researches.html", **researches
         )
     )
-    invalidate_cache(["get_researches", "research_page", "knowledge_hub"])
+    invalidate_cache(
+        [
+            "get_researches",
+            "research_page",
+            "knowledge_hub",
+            "filter_knowledge_hub",
+        ]
+    )
     return add_toast(resp, "success", _("Research updated successfully"))
 
 
@@ -358,12 +383,19 @@ def delete_research(research_id):
             **researches,
         )
     )
-    invalidate_cache(["get_researches", "research_page", "knowledge_hub"])
+    invalidate_cache(
+        [
+            "get_researches",
+            "research_page",
+            "knowledge_hub",
+            "filter_knowledge_hub",
+        ]
+    )
     return add_toast(resp, "success", _("Research deleted successfully"))
 
 
 @bp.route("/dashboard/knowledge-hub/members", methods=["GET"])
-@cache_response()
+@cache_response(vary=["locale"], query={"page": 1})
 def get_members():
     """Get members."""
     member_service = MemberService()
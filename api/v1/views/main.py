@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional, Protocol, Type
+from typing import Any, Dict, List, Optional, Protocol, Type
 
 from flask import (
     abort,
@@ -11,8 +11,10 @@ from flask import (
     url_for,
 )
 from flask_babel import gettext as _
+from sqlalchemy import func
 
 from api.v1.views import bp
+from app.models import Project
 from app.services import (
     CourseService,
     ManageContactUs,
@@ -25,7 +27,8 @@ from app.services import (
 )
 from config import Config
 from utils.auth_utils import login_required
-from utils.cache_mgr import cache_response
+from utils.cache_mgr import cache_response, invalidate_cache
+from utils.cdn_cache import cdn_cache
 from utils.file_manager import create_file_manager
 from utils.image_processing import ImageProcessing
 from utils.rate_limiter import RateLimits, rate_limit
@@ -60,50 +63,147 @@ TAB_CONTENT_MAP = {
     },
 }
 
+# Dashboard tabs paginated with cursors, deep pages cost the same as page 1
+KEYSET_TABS = {"projects", "subscribers"}
+
+# Dashboard lists with multi-select actions:
+# tab -> (service, list template, cached views showing the items)
+BULK_TABS = {
+    "projects": (
+        ProjectService,
+        "partials/dashboard/project-list.html",
+        ["projects", "project_page", "filter_projects"],
+    ),
+    "news": (
+        NewsService,
+        "partials/dashboard/news-list.html",
+        ["news", "get_single_news", "get_news", "index"],
+    ),
+    "courses": (
+        CourseService,
+        "partials/dashboard/knowledge_hub/courses-list.html",
+        ["get_courses", "knowledge_hub", "filter_knowledge_hub"],
+    ),
+    "podcasts": (
+        PodcastService,
+        "partials/dashboard/knowledge_hub/podcasts-list.html",
+        ["get_podcasts", "knowledge_hub", "filter_knowledge_hub"],
+    ),
+    "researches": (
+        ResearchService,
+        "partials/dashboard/knowledge_hub/researches-list.html",
+        [
+            "get_researches",
+            "research_page",
+            "knowledge_hub",
+            "filter_knowledge_hub",
+        ],
+    ),
+}
+
+# Multi-select actions setting fields, besides `delete`. Completing a
+# project dates it like the project form, unless it has a date already
+BULK_UPDATES = {
+    "projects": {
+        "ongoing": {"status": "ongoing"},
+        "completed": {
+            "status": "completed",
+            "date_of_completion": func.coalesce(
+                Project.date_of_completion, func.current_date()
+            ),
+        },
+    },
+}
+
+# Order of the public projects listing
+PROJECTS_SORT = "COALESCE(date_of_completion, created_at) DESC"
+
+# Columns shown by the project and research cards, the content excerpt is
+# loaded by the "cards" view of their services
+CARD_COLUMNS = ["title", "author", "date_of_completion", "hero_image"]
+
+# Knowledge hub tabs filtered by name and tag (see `filter_knowledge_hub`):
+# tab -> (service, card template, multilingual name field)
+FILTER_TABS = {
+    "courses": (CourseService, "partials/cards/course.html", "course_name"),
+    "podcasts": (
+        PodcastService,
+        "partials/cards/podcast.html",
+        "podcast_name",
+    ),
+    "researches": (ResearchService, "partials/cards/research.html", None),
+}
+
 
 class PaginatedService(Protocol):
-    def get_all(self, page: int = 1, **kwargs: Any) -> Dict[str, Any]:
+    def get_all(
+        self,
+        page: int = 1,
+        cursor: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        view: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
         """Method signature required for paginated services."""
         ...
 
 
 def get_paginated_data(
-    service: Type[PaginatedService], page: int = 1, sort: Optional[str] = None
+    service: Type[PaginatedService],
+    page: int = 1,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    view: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Helper function to fetch paginated and sorted data from a service."""
+    options: Dict[str, Any] = dict(cursor=cursor, columns=columns, view=view)
     return (
-        service().get_all(page=page, sort=sort)
+        service().get_all(page=page, sort=sort, **options)
         if sort
-        else service().get_all(page=page)
+        else service().get_all(page=page, **options)
     )
 
 
 @bp.route("/")
+@cdn_cache("news")
 @response(template_file="index.html")
-@cache_response()
+@cache_response(
+    local=True, stale_while_revalidate=Config.CACHE_STALE_TIMEOUT, query={}
+)
 def index():
     """Home page"""
     return get_paginated_data(NewsService)
 
 
 @bp.route("/news")
+@cdn_cache("news")
 @response(template_file="partials/news/cards.html")
-@cache_response()
+@cache_response(
+    local=True, stale_while_revalidate=Config.CACHE_STALE_TIMEOUT, query={}
+)
 def news():
     """News page"""
     return get_paginated_data(NewsService)
 
 
 @bp.route("/projects")
+@cdn_cache("projects", vary=["hx-projects"])
 @response(template_file="projects.html")
-@cache_response()
+@cache_response(
+    local=True,
+    stale_while_revalidate=Config.CACHE_STALE_TIMEOUT,
+    vary=["hx-projects", "locale"],
+    query={"cursor": ""},
+)
 def projects():
     """Projects page"""
-    page = request.args.get("page", type=int, default=1)
     projects = get_paginated_data(
         ProjectService,
-        page,
-        sort="COALESCE(date_of_completion, created_at) DESC",
+        sort=PROJECTS_SORT,
+        cursor=request.args.get("cursor", ""),
+        columns=CARD_COLUMNS,
+        view="cards",
     )
 
     if request.headers.get("hx-projects"):
@@ -115,8 +215,9 @@ def projects():
 
 
 @bp.route("/team")
+@cdn_cache("team")
 @response(template_file="team.html")
-@cache_response()
+@cache_response(local=True, query={})
 def team():
     """Team page"""
     return get_paginated_data(TeamService, sort='teams."order"')
@@ -164,6 +265,7 @@ def dashboard():
     data = get_paginated_data(
         service,
         sort='teams."order"' if service == TeamService else None,
+        cursor="" if tab_query in KEYSET_TABS else None,
     )
 
     if not request.args.get("q"):
@@ -172,9 +274,44 @@ def dashboard():
     return make_response(render_template(template, **data))
 
 
+@bp.route("/dashboard/bulk/<tab>", methods=["POST"])
+@login_required()
+def bulk_action(tab):
+    """Apply a multi-select action to the selected items of a list"""
+    if tab not in BULK_TABS:
+        abort(404)
+    service_class, template, cached_views = BULK_TABS[tab]
+    service = service_class()
+    action = request.form.get("action")
+    uuids = request.form.getlist("uuids")
+
+    if not uuids:
+        return add_toast(
+            make_response("", 400), "warning", _("no_items_selected")
+        )
+    if action == "delete":
+        count = service.bulk_soft_delete(uuids)
+    elif action in BULK_UPDATES.get(tab, {}):
+        count = service.bulk_update(uuids, **BULK_UPDATES[tab][action])
+    else:
+        abort(400)
+
+    data = get_paginated_data(
+        service_class, cursor="" if tab in KEYSET_TABS else None
+    )
+    resp = make_response(render_template(template, **data))
+    invalidate_cache(cached_views)
+    return add_toast(resp, "success", _("bulk_action_done", count=count))
+
+
 @bp.route("/knowledge-hub")
+@cdn_cache("knowledge-hub", vary=["hx-tab"])
 @response(template_file="knowledge-hub.html")
-@cache_response()
+@cache_response(
+    local=True,
+    vary=["hx-tab", "locale"],
+    query={"q": "researches", "page": 1},
+)
 def knowledge_hub():
     """Knowledge Hub page"""
     tab_query = request.args.get("q", "researches")
@@ -185,10 +322,15 @@ def knowledge_hub():
         return dict(tab="researches")
 
     template, service = tab_info
-    data = get_paginated_data(service, page)
+    data = get_paginated_data(
+        service,
+        page,
+        columns=CARD_COLUMNS if service == ResearchService else None,
+        view="cards",
+    )
 
-    if tab_query == "courses":
-        data = service().process_courses_data(data)
+    if tab_query in FILTER_TABS:
+        data.update(filter_options(tab_query))
 
     if request.headers.get("hx-tab"):
         return make_response(render_template(template, **data))
@@ -196,25 +338,56 @@ def knowledge_hub():
     return dict(tab="researches", **data)
 
 
-@bp.route("/knowledge-hub/filter-courses")
-@cache_response()
-def filter_courses():
-    """Filter courses based on selected course name or tag."""
-    course_name, tag, locale = (
-        request.args.get("course_name"),
-        request.args.get("tag"),
-        request.args.get("locale", "en"),
+def filter_options(tab: str) -> Dict[str, Any]:
+    """Names and tags a knowledge hub tab can be filtered by, per locale."""
+    service_class, _template, name_field = FILTER_TABS[tab]
+    service = service_class()
+    locales = Config.BABEL_SUPPORTED_LOCALES
+    return dict(
+        unique_names=(
+            {
+                locale: service.json_values(name_field, locale)
+                for locale in locales
+            }
+            if name_field
+            else {}
+        ),
+        unique_tags={
+            locale: service.json_values("tags", locale, array=True)
+            for locale in locales
+        },
     )
 
-    courses_data = get_paginated_data(CourseService)
-    courses_data["data"] = [
-        course
-        for course in courses_data.get("data", [])
-        if (not course_name or course["course_name"][locale] == course_name)
-        and (not tag or tag in course["tags"][locale])
-    ]
 
-    return render_template("partials/cards/course.html", **courses_data)
+@bp.route("/knowledge-hub/filter-<tab>")
+@cache_response(
+    vary=["locale"],
+    query={"name": "", "tag": "", "locale": "en", "page": 1},
+)
+def filter_knowledge_hub(tab):
+    """Filter the cards of a knowledge hub tab by name and tag."""
+    if tab not in FILTER_TABS:
+        abort(404)
+    service, template, name_field = FILTER_TABS[tab]
+    name, tag = request.args.get("name", ""), request.args.get("tag", "")
+    locale = request.args.get("locale", "en")
+    page = request.args.get("page", type=int, default=1)
+    if locale not in Config.BABEL_SUPPORTED_LOCALES:
+        abort(400)
+
+    fragments: Dict[str, Any] = {}
+    if name and name_field:
+        fragments[name_field] = {locale: name}
+    if tag:
+        fragments["tags"] = {locale: [tag]}
+
+    data = service().filter_by_json(
+        page=page,
+        columns=CARD_COLUMNS if tab == "researches" else None,
+        view="cards",
+        **fragments,
+    )
+    return render_template(template, **data, name=name, tag=tag)
 
 
 @bp.route("/contact-us", methods=["POST"])
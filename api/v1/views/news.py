@@ -7,6 +7,7 @@ from marshmallow import ValidationError
 from api.v1.views import bp
 from app.services import NewsService
 from utils.cache_mgr import cache_response, invalidate_cache
+from utils.cdn_cache import cdn_cache
 from utils.toast_notify import with_toast
 from utils.view_modifiers import response
 
@@ -22,7 +23,7 @@ def retrieve_form():
 
 @bp.route("/dashboard/news", methods=["GET"])
 @response(template_file="partials/dashboard/news-list.html")
-@cache_response()
+@cache_response(query={"page": 1})
 def get_news():
     """Get news paginated"""
     page = request.args.get("page", type=int, default=1)
@@ -33,8 +34,9 @@ def get_news():
 
 
 @bp.route("/news/<id>", methods=["GET"])
+@cdn_cache("news", "news:{id}")
 @response(template_file="single-news.html")
-@cache_response()
+@cache_response(query={})
 def get_single_news(id):
     """Get single news"""
     news = news_service.get_by_uuid(id)
@@ -4,6 +4,7 @@ from flask_babel import gettext as _
 from api.v1.views import bp
 from app.services import ProjectService
 from utils.cache_mgr import cache_response, invalidate_cache
+from utils.cdn_cache import cdn_cache
 from utils.toast_notify import add_toast
 from utils.view_modifiers import response
 
@@ -11,8 +12,9 @@ project_service = ProjectService()
 
 
 @bp.route("/projects/<uuid>", methods=["GET"])
+@cdn_cache("projects", "project:{uuid}")
 @response(template_file="project-page.html")
-@cache_response()
+@cache_response(query={})
 def project_page(uuid):
     """Project page"""
     project = project_service.get_project_by_uuid(uuid)
@@ -25,20 +27,26 @@ def project_page(uuid):
 
 
 @bp.route("/dashboard/projects", methods=["GET"])
-@cache_response()
+@cache_response(
+    vary=["locale"],
+    query={"search": "", "filter": "all", "page": 1, "cursor": None},
+)
 def filter_projects():
     """Filter projects by status and search string"""
     search_str = request.args.get("search", "")
     status = request.args.get("filter", "all")
     page = int(request.args.get("page", 1))
+    cursor = request.args.get("cursor")
 
     if search_str:
-        projects = project_service.search_projects_by_title(search_str)
+        projects = project_service.search_projects_by_title(search_str, page)
     else:
         if status in ["ongoing", "completed"]:
-            projects = project_service.get_all(page=page, status=status)
+            projects = project_service.get_all(
+                page=page, cursor=cursor, status=status
+            )
         else:
-            projects = project_service.get_all(page=page)
+            projects = project_service.get_all(page=page, cursor=cursor)
 
     return make_response(
         render_template(
@@ -88,11 +88,14 @@ def _render_unsubscribe_response(email, success, message, status):
 
 
 @bp.route("/dashboard/subscribers", methods=["GET"])
-@cache_response()
+@cache_response(
+    vary=["locale"], query={"search": "", "page": 1, "cursor": None}
+)
 def filter_subscribers():
     """Filter subscribers by search string."""
     search_str = request.args.get("search", "")
     page = int(request.args.get("page", 1))
+    cursor = request.args.get("cursor")
 
     # Fetch subscribers based on search string
     if search_str:
@@ -100,7 +103,7 @@ def filter_subscribers():
             search_str
         )
     else:
-        subscribers_res = subscriber_service.get_all(page=page)
+        subscribers_res = subscriber_service.get_all(page=page, cursor=cursor)
 
     return make_response(
         render_template(
@@ -10,7 +10,7 @@ team_service = TeamService()
 
 
 @bp.route("/dashboard/team-members", methods=["GET"])
-@cache_response()
+@cache_response(vary=["locale"], query={"search": "", "page": 1})
 def filter_team_members():
     """Filter team members by search string."""
     search_str = request.args.get("search", "")
@@ -18,7 +18,9 @@ def filter_team_members():
 
     # Fetch team members based on search string
     if search_str:
-        team_members_res = team_service.search_team_members_by_name(search_str)
+        team_members_res = team_service.search_team_members_by_name(
+            search_str, page
+        )
     else:
         team_members_res = team_service.get_all(
             page=page, sort='teams."order"'
@@ -106,15 +108,10 @@ def update_team_member(member_id):
 @bp.route("/dashboard/delete-team-member/<member_id>", methods=["DELETE"])
 def delete_team_member(member_id):
     """Delete a team member."""
-    order = team_service.get_by_uuid(member_id).get("order")
-    success = team_service.delete(member_id)
-    if not success:
+    if not team_service.delete_team_member(member_id):
         resp = make_response("", 404)
         return add_toast(resp, "error", _("Team member not found"))
 
-    # Update the order of other team members
-    team_service.update_team_member_order(order=order + 1, mode=-1)
-
     members_res = team_service.get_all(sort='teams."order"')
     resp = make_response(
         render_template(
@@ -124,3 +121,20 @@ def delete_team_member(member_id):
     )
     invalidate_cache(["filter_team_members", "team"])
     return add_toast(resp, "success", _("Team member deleted successfully"))
+
+
+@bp.route("/dashboard/team-members/reorder", methods=["POST"])
+def reorder_team_members():
+    """Save the order of the team members dragged into place."""
+    uuids = request.form.getlist("uuids")
+    page = request.form.get("page", type=int, default=1)
+    if not team_service.reorder_team_members(uuids):
+        resp = make_response("", 400)
+        return add_toast(resp, "error", _("team_order_not_saved"))
+
+    members_res = team_service.get_all(page=page, sort='teams."order"')
+    resp = make_response(
+        render_template("partials/dashboard/team-list.html", **members_res)
+    )
+    invalidate_cache(["filter_team_members", "team"])
+    return add_toast(resp, "success", _("team_order_saved"))
@@ -5,6 +5,7 @@ from datetime import datetime
 from flask import (
     Flask,
     Response,
+    g,
     make_response,
     render_template,
     request,
@@ -13,21 +14,25 @@ from flask import (
 from flask_babel import Babel
 from flask_babel import gettext as _
 from flask_cors import CORS
-from flask_minify import Minify
 from flask_wtf.csrf import CSRFProtect
 from html_sanitizer import Sanitizer
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 from api.v1.views import bp as api_blueprint
+from app.cli import register_commands
 from app.extensions import (
     db,
     get_file_url,
     get_locale,
     init_cache,
+    init_minify,
     init_session,
     migrate,
 )
 from config import Config
+from utils.cache_mgr import invalidation_hooks
+from utils.cache_warm import warm_after_invalidation
+from utils.cdn_cache import init_cdn_purge, set_shared_cache_headers
 from utils.rate_limiter import init_limiter
 from utils.toast_notify import add_toast
 
@@ -85,13 +90,19 @@ def register_extensions(app):
     # Session and caching
     init_session(app)
     init_cache(app)
+    if (
+        Config.CACHE_WARM_ON_INVALIDATE
+        and warm_after_invalidation not in invalidation_hooks
+    ):
+        invalidation_hooks.append(warm_after_invalidation)
+    init_cdn_purge(app, invalidation_hooks)
 
     # Security
     CSRFProtect(app)
     init_limiter(app)
 
     # Performance
-    Minify(app=app, html=True, js=True, cssless=True)
+    init_minify(app)
 
 
 def register_blueprints(app):
@@ -136,10 +147,16 @@ def register_context_processors(app):
         """Inject the locale into each rendered template."""
         lang = request.args.get("lang")
         if lang and lang in Config.BABEL_SUPPORTED_LOCALES:
-            session["lang"] = lang
+            if not g.get("shared_cache"):
+                session["lang"] = lang
             return {"locale": lang}
         return {"locale": get_locale()}
 
+    @app.context_processor
+    def inject_shared_cache():
+        """Inject whether the page is rendered for a shared (CDN) cache."""
+        return {"shared_cache": g.get("shared_cache", False)}
+
     @app.context_processor
     def inject_current_year():
         """Inject current year into templates."""
@@ -183,6 +200,8 @@ def register_after_request(app):
         )
         return response
 
+    app.after_request(set_shared_cache_headers)
+
 
 def create_app(config_class=Config):
     """Create and configure the Flask application.
@@ -225,6 +244,9 @@ def create_app(config_class=Config):
     # Register after request handlers
     register_after_request(app)
 
+    # Register CLI commands
+    register_commands(app)
+
     # Configure URL map
     app.url_map.strict_slashes = False
 
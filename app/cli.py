@@ -0,0 +1,760 @@
+"""Flask CLI commands for cache maintenance, migrations and benchmarking."""
+
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from threading import Barrier
+from time import perf_counter
+from typing import Any, Callable, List, Tuple
+from uuid import uuid4
+
+import click
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+from sqlalchemy import case, cast, exists, func, insert, select, text, true
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.extensions import db
+from app.models import (
+    Course,
+    CourseMember,
+    Member,
+    News,
+    Podcast,
+    PodcastMember,
+    Project,
+    Research,
+    Subscriber,
+    Team,
+)
+from app.services import (
+    CourseService,
+    NewsService,
+    PodcastService,
+    ProjectService,
+    ResearchService,
+    SubscriberService,
+    TeamService,
+)
+from config import Config
+from utils.cache_mgr import (
+    get_cache_redis,
+    local_cache,
+    tag_key,
+    unlink_tagged,
+)
+from utils.cache_stats import (
+    hit_ratio,
+    read_stats,
+    reset_stats,
+    sample_memory,
+)
+from utils.cache_warm import warm_cache
+from utils.cdn_cache import LocalPurgeServer
+from utils.db_utils import (
+    capture_queries,
+    count_queries,
+    expect_queries,
+    explain,
+    seq_scans,
+)
+from utils.map_i18n import normailze_i18n
+from utils.purge import purge_deleted, purge_report
+from utils.schema_migrations import (
+    downgrade_jsonb,
+    downgrade_uuid,
+    stored_as,
+    upgrade_jsonb,
+    upgrade_uuid,
+)
+from utils.serializer import to_json
+
+# Commands to manage the response cache (`flask cache ...`)
+cache_cli = AppGroup("cache", help="Manage the response cache.")
+
+# Commands to benchmark the application (`flask bench ...`)
+bench_cli = AppGroup("bench", help="Run performance benchmarks.")
+
+# Hand-written schema migrations (`flask schema ...`)
+schema_cli = AppGroup("schema", help="Run hand-written schema migrations.")
+
+
+@cache_cli.command("warm")
+@click.option(
+    "--pages",
+    default=Config.CACHE_WARM_PAGES,
+    help="Pages of each paginated listing to render.",
+)
+@click.option(
+    "--concurrency",
+    default=Config.CACHE_WARM_CONCURRENCY,
+    help="Views rendered at the same time.",
+)
+def warm(pages: int, concurrency: int) -> None:
+    """Pre-render the public pages in every locale."""
+    start = perf_counter()
+    warmed, total = warm_cache(
+        current_app._get_current_object(), pages, concurrency
+    )
+    click.echo(
+        f"warmed {warmed}/{total} pages in {perf_counter() - start:.1f} s"
+    )
+
+
+@cache_cli.command("stats")
+@click.option("--sample", default=1000, help="Keys sampled for memory usage.")
+@click.option("--reset", is_flag=True, help="Reset the counters afterwards.")
+def stats(sample: int, reset: bool) -> None:
+    """Show the cache telemetry of each view and the Redis memory usage."""
+    counters = read_stats()
+    click.echo(
+        f"{'view':<22} {'hit %':>6} {'hits':>8} {'misses':>7} "
+        f"{'fill ms':>8} {'avg KiB':>8} {'invalidations':>14}"
+    )
+    for tag, fields in counters.items():
+        fills = fields.get("fills", 0)
+        sized = sum(
+            v for k, v in fields.items() if k.startswith("size_bytes_bucket:")
+        )
+        hits = sum(v for k, v in fields.items() if k.startswith("hits_"))
+        invalidations = ", ".join(
+            f"{k.split(':', 1)[1]}={v:g}"
+            for k, v in sorted(fields.items())
+            if k.startswith("invalidations:")
+        )
+        click.echo(
+            f"{tag:<22} {hit_ratio(fields) * 100:>6.1f} {hits:>8g} "
+            f"{fields.get('misses', 0):>7g} "
+            f"{fields.get('fill_seconds_sum', 0) * 1000 / (fills or 1):>8.1f} "
+            f"{fields.get('size_bytes_sum', 0) / 1024 / (sized or 1):>8.1f} "
+            f"{invalidations or '-':>14}"
+        )
+
+    tags = {
+        view.cache_tag
+        for view in current_app.view_functions.values()
+        if hasattr(view, "cache_tag")
+    }
+    click.echo(f"\n{'prefix':<22} {'keys':>8} {'KiB':>10}  (sampled)")
+    usage = sample_memory(tags | set(counters), sample)
+    for prefix, (keys, size) in sorted(
+        usage.items(), key=lambda item: -item[1][1]
+    ):
+        click.echo(f"{prefix:<22} {keys:>8} {size / 1024:>10.1f}")
+
+    if reset:
+        reset_stats()
+
+
+@cache_cli.command("purge")
+@click.argument("keys", nargs=-1, required=True)
+def purge(keys) -> None:
+    """Purge the CDN copies tagged with the given surrogate keys."""
+    accepted = current_app.extensions["cdn_purge"].purge(list(keys))
+    click.echo(
+        f"purge {'accepted' if accepted else 'failed'}: {' '.join(keys)}"
+    )
+
+
+@cache_cli.command("purge-server")
+@click.option("--host", default="127.0.0.1", help="Interface to listen on.")
+@click.option("--port", default=8099, help="Port to listen on.")
+def purge_server(host: str, port: int) -> None:
+    """Run a local stand-in of the CDN purge API, printing each purge."""
+    server = LocalPurgeServer(host, port)
+    click.echo(f"listening on {server.url} (CDN_PURGE_BACKEND=http)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for keys in server.purged:
+            click.echo(f"purged: {' '.join(keys)}")
+        server.server_close()
+
+
+BENCH_KEY_PREFIX = "swea_bench_"
+
+
+def _clear_bench_keys(redis_conn) -> None:
+    """Remove every key written by a benchmark run."""
+    with redis_conn.pipeline(transaction=False) as pipe:
+        for key in redis_conn.scan_iter(f"{BENCH_KEY_PREFIX}*", count=1000):
+            pipe.unlink(key)
+        pipe.execute()
+
+
+def _fill_bench_keys(redis_conn, keys: int, endpoints: int) -> None:
+    """Write `keys` cache entries spread over `endpoints` tagged endpoints."""
+    with redis_conn.pipeline(transaction=False) as pipe:
+        for i in range(keys):
+            endpoint = f"endpoint{i % endpoints}"
+            key = f"{BENCH_KEY_PREFIX}{endpoint}_get_query_page-{i}"
+            pipe.set(key, b"!", ex=600)
+            pipe.sadd(tag_key(endpoint, prefix=BENCH_KEY_PREFIX), key)
+            if i % 1000 == 999:
+                pipe.execute()
+        pipe.execute()
+
+
+@bench_cli.command("invalidate")
+@click.option("--keys", default=100_000, help="Number of cached keys.")
+@click.option("--endpoints", default=10, help="Number of cached endpoints.")
+def bench_invalidate(keys: int, endpoints: int) -> None:
+    """Compare SCAN and tag-set invalidation of one endpoint."""
+    redis_conn = get_cache_redis()
+    target = "endpoint0"
+
+    _clear_bench_keys(redis_conn)
+    _fill_bench_keys(redis_conn, keys, endpoints)
+    start = perf_counter()
+    with redis_conn.pipeline() as pipe:
+        for key in redis_conn.scan_iter(
+            f"{BENCH_KEY_PREFIX}{target}_*", count=1000
+        ):
+            pipe.unlink(key)
+        pipe.execute()
+    scan_time = perf_counter() - start
+
+    _clear_bench_keys(redis_conn)
+    _fill_bench_keys(redis_conn, keys, endpoints)
+    start = perf_counter()
+    removed = unlink_tagged(
+        redis_conn, [tag_key(target, prefix=BENCH_KEY_PREFIX)]
+    )
+    tag_time = perf_counter() - start
+
+    _clear_bench_keys(redis_conn)
+    click.echo(f"keys: {keys}, invalidated: {removed}")
+    click.echo(f"scan: {scan_time * 1000:.1f} ms")
+    click.echo(f"tags: {tag_time * 1000:.1f} ms")
+
+
+def _burst(path: str, size: int) -> int:
+    """Send `size` concurrent GET requests to `path`, return the query count."""
+    barrier = Barrier(size)
+
+    def hit(_):
+        client = current_app.test_client()
+        barrier.wait()
+        return client.get(path).status_code
+
+    with count_queries() as statements:
+        with ThreadPoolExecutor(max_workers=size) as pool:
+            list(pool.map(hit, range(size)))
+    return len(statements)
+
+
+@bench_cli.command("stampede")
+@click.option("--path", default="/", help="Path requested by the burst.")
+@click.option("--endpoint", default="index", help="Cached view of the path.")
+@click.option("--requests", "size", default=50, help="Concurrent requests.")
+def bench_stampede(path: str, endpoint: str, size: int) -> None:
+    """Count DB queries of a request burst on a freshly invalidated key."""
+    redis_conn = get_cache_redis()
+
+    configured = Config.CACHE_SINGLE_FLIGHT
+    try:
+        for single_flight in (False, True):
+            Config.CACHE_SINGLE_FLIGHT = single_flight
+            unlink_tagged(redis_conn, [tag_key(endpoint)])
+            local_cache.clear()
+            queries = _burst(path, size)
+            click.echo(
+                f"single-flight {'on ' if single_flight else 'off'}: "
+                f"{size} requests, {queries} queries"
+            )
+    finally:
+        Config.CACHE_SINGLE_FLIGHT = configured
+
+
+# Tables seeded by `flask bench explain`
+SEEDED_MODELS = [Course, News, Podcast, Project, Research, Subscriber, Team]
+
+
+def _hot_queries() -> List[Tuple[str, Callable[[], Any]]]:
+    """The service calls behind the busiest pages, by label."""
+    from api.v1.views.main import CARD_COLUMNS, PROJECTS_SORT
+
+    return [
+        (
+            "projects cards",
+            lambda: ProjectService().get_all(
+                cursor="",
+                sort=PROJECTS_SORT,
+                columns=CARD_COLUMNS,
+                view="cards",
+            ),
+        ),
+        ("projects list", lambda: ProjectService().get_all(page=3)),
+        (
+            "projects by status",
+            lambda: ProjectService().get_all(status="ongoing"),
+        ),
+        # A valid UUID, a malformed one is rejected before any query
+        ("project page", lambda: ProjectService().get_by_uuid(str(uuid4()))),
+        (
+            "research cards",
+            lambda: ResearchService().get_all(
+                columns=CARD_COLUMNS, view="cards"
+            ),
+        ),
+        ("courses", lambda: CourseService().get_all()),
+        (
+            "courses by tag",
+            lambda: CourseService().filter_by_json(
+                tags={"en": ["seed tags 42"]}
+            ),
+        ),
+        ("podcasts", lambda: PodcastService().get_all()),
+        ("news", lambda: NewsService().get_all()),
+        ("team", lambda: TeamService().get_all(sort='teams."order"')),
+        ("subscribers", lambda: SubscriberService().get_all(cursor="")),
+        (
+            "subscriber lookup",
+            lambda: SubscriberService().search_subscribers_by_email(
+                "seed email 42"
+            ),
+        ),
+    ]
+
+
+def _seed_value(column, n):
+    """Made-up value of `column` in the n-th seeded row, as SQL."""
+    if column.name == "uuid":
+        return func.gen_random_uuid()
+    if column.name == "deleted_at":
+        # Every tenth row is soft-deleted
+        return case((n % 10 == 0, func.now()))
+    if isinstance(column.type, (db.Date, db.DateTime)):
+        return func.now() - func.make_interval(0, 0, 0, 0, 0, n)
+    if isinstance(column.type, db.Enum):
+        enums = column.type.enums
+        return cast(case((n % 2 == 0, enums[0]), else_=enums[-1]), column.type)
+    if isinstance(column.type, db.Integer):
+        return n
+    label = func.concat(f"seed {column.name} ", n)
+    if isinstance(column.type, db.JSON):
+        json = "jsonb" if isinstance(column.type, JSONB) else "json"
+        if column.name == "tags":
+            label = getattr(func, f"{json}_build_array")(label)
+        return getattr(func, f"{json}_build_object")("en", label, "ar", label)
+    return label
+
+
+def _seed(model, rows: int) -> None:
+    """Insert `rows` made-up rows into the table of `model`."""
+    series = func.generate_series(1, rows).table_valued("n")
+    columns = [
+        column
+        for column in model.__table__.columns
+        if column.computed is None
+        and (not column.nullable or column.name.endswith("_at"))
+    ]
+    db.session.execute(
+        insert(model.__table__).from_select(
+            [column.name for column in columns],
+            select(
+                *(_seed_value(column, series.c.n) for column in columns)
+            ).select_from(series),
+        )
+    )
+    db.session.connection().exec_driver_sql(f"ANALYZE {model.__tablename__}")
+
+
+@bench_cli.command("explain")
+@click.option(
+    "--seed",
+    "rows",
+    default=20_000,
+    help="Rows added to each table first (rolled back afterwards).",
+)
+def bench_explain(rows: int) -> None:
+    """
+    EXPLAIN the hot queries, failing on sequential scans of seeded tables.
+
+    Exact counts read most of the live rows whatever the indexes, their
+    sequential scans are reported but do not fail the check.
+    """
+    seeded = {model.__tablename__ for model in SEEDED_MODELS}
+    failures = 0
+    try:
+        if rows:
+            for model in SEEDED_MODELS:
+                _seed(model, rows)
+
+        for label, call in _hot_queries():
+            with capture_queries() as queries:
+                call()
+            for statement, parameters in queries:
+                plan = explain(statement, parameters)
+                scanned = sorted(set(seq_scans(plan)) & seeded)
+                is_count = statement.lstrip().startswith("SELECT count(")
+                status = "ok"
+                if scanned:
+                    status = f"seq scan on {', '.join(scanned)}"
+                    if is_count:
+                        status += " (count)"
+                    else:
+                        failures += 1
+                click.echo(
+                    f"{label:<20} {plan['Node Type']:<18} "
+                    f"{plan['Total Cost']:>10.1f}  {status}"
+                )
+    finally:
+        db.session.rollback()
+
+    if failures:
+        raise click.ClickException(
+            f"{failures} hot queries scan a whole table"
+        )
+    click.echo("no sequential scan on the hot paths")
+
+
+def _bench_projects(rows: int) -> List[Project]:
+    """Project rows with the fields of a typical project, not persisted."""
+
+    def i18n(n: int, field: str):
+        return {"en": f"{field} {n}", "ar": f"{field} {n} ar"}
+
+    now = datetime.now()
+    return [
+        Project(
+            uuid=f"00000000-0000-0000-0000-{n:012d}",
+            title=i18n(n, "title"),
+            author={"name": i18n(n, "author"), "email": "a@example.com"},
+            date_of_completion=date(2024, 1, 1),
+            status="completed",
+            content=[i18n(n, "content " * 40) for _ in range(3)],
+            tags={"en": ["ai", "data"], "ar": ["ai", "data"]},
+            hero_image="projects/hero.webp",
+            testimonials=[i18n(n, "testimonial")],
+            created_at=now,
+            updated_at=now,
+        )
+        for n in range(rows)
+    ]
+
+
+def _legacy_to_dict(item) -> dict:
+    """`to_dict` as it was, a `getattr` walk of `__table__.columns`."""
+    return {
+        column.name: getattr(item, column.name)
+        for column in item.__table__.columns
+        if not column.info.get("search")
+    }
+
+
+@bench_cli.command("serialize")
+@click.option("--rows", default=10_000, help="Rows serialized per run.")
+@click.option("--runs", default=5, help="Runs, the best one is reported.")
+def bench_serialize(rows: int, runs: int) -> None:
+    """Compare the compiled row serializer with the getattr walk."""
+    items = _bench_projects(rows)
+
+    def best(run: Callable[[], Any]) -> float:
+        timings = []
+        for _ in range(runs):
+            start = perf_counter()
+            run()
+            timings.append(perf_counter() - start)
+        return min(timings) * 1000
+
+    def legacy_localized():
+        data = [_legacy_to_dict(item) for item in items]
+        return normailze_i18n(lambda: {"locale": "en", "data": data})()
+
+    results = [
+        ("getattr walk", best(lambda: [_legacy_to_dict(i) for i in items])),
+        ("compiled", best(lambda: [item.to_dict() for item in items])),
+        ("getattr + normailze_i18n", best(legacy_localized)),
+        ("compiled, locale", best(lambda: [i.to_dict("en") for i in items])),
+        ("compiled, JSON bytes", best(lambda: to_json(items, "en"))),
+    ]
+    for label, elapsed in results:
+        click.echo(f"{label:<26} {elapsed:>8.1f} ms / {rows} rows")
+
+
+# Knowledge hub tabs, as (item model, item key of the member links)
+KNOWLEDGE_HUB_TABS = {
+    "courses": (Course, CourseMember.course_uuid),
+    "podcasts": (Podcast, PodcastMember.podcast_uuid),
+    "researches": (Research, None),
+}
+
+# Members presenting each seeded course and podcast
+MEMBERS_PER_ITEM = 3
+
+
+def _link_members(model, link_key) -> None:
+    """Link the live rows of `model` without members to the first members."""
+    items = (
+        select(model.uuid)
+        .where(
+            model.deleted_at.is_(None),
+            ~exists().where(link_key == model.uuid),
+        )
+        .subquery()
+    )
+    members = select(Member.uuid).limit(MEMBERS_PER_ITEM).subquery()
+    db.session.execute(
+        insert(link_key.class_).from_select(
+            ["uuid", link_key.key, "member_uuid"],
+            select(
+                func.gen_random_uuid(),
+                items.c.uuid,
+                members.c.uuid,
+            ).select_from(items.join(members, true())),
+        )
+    )
+
+
+def _render_knowledge_hub(tab: str) -> None:
+    """Render a knowledge hub tab as switched to, bypassing the caches."""
+    view = inspect.unwrap(
+        current_app.view_functions["app_views.knowledge_hub"]
+    )
+    with current_app.test_request_context(
+        f"/knowledge-hub?q={tab}", headers={"hx-tab": "true"}
+    ):
+        view()
+
+
+@bench_cli.command("queries")
+@click.option(
+    "--rows", default=10, help="Items on the page of the second render."
+)
+def bench_queries(rows: int) -> None:
+    """
+    Count the queries rendering each knowledge hub tab.
+
+    Each tab is rendered with one seeded item, then with `rows` (rolled
+    back afterwards): the count must not grow with the items on the page.
+    """
+    failures = 0
+    try:
+        _seed(Member, MEMBERS_PER_ITEM)
+        for tab, (model, link_key) in KNOWLEDGE_HUB_TABS.items():
+            _seed(model, 1)
+            if link_key is not None:
+                _link_members(model, link_key)
+            with count_queries() as statements:
+                _render_knowledge_hub(tab)
+            expected = len(statements)
+
+            _seed(model, rows - 1)
+            if link_key is not None:
+                _link_members(model, link_key)
+            try:
+                with expect_queries(expected):
+                    _render_knowledge_hub(tab)
+                status = "ok"
+            except AssertionError as e:
+                failures += 1
+                status = str(e).splitlines()[0]
+            click.echo(f"{tab:<12} {expected:>3} queries  {status}")
+    finally:
+        db.session.rollback()
+
+    if failures:
+        raise click.ClickException(
+            f"{failures} tabs run more queries with more items"
+        )
+    click.echo("constant number of queries per page")
+
+
+# Queries timed by `flask bench jsonb`, `{tags}` is the indexed tags
+BENCH_JSON_QUERIES = [
+    (
+        "listing",
+        "SELECT uuid, title ->> 'en', tags -> 'en' FROM {table} "
+        "ORDER BY updated_at DESC LIMIT 10 OFFSET 100",
+    ),
+    ("extract all", "SELECT title ->> 'en' FROM {table}"),
+    (
+        "substring",
+        "SELECT uuid FROM {table} WHERE title ->> 'en' ILIKE '%title 4242%'",
+    ),
+    (
+        "tag filter",
+        "SELECT uuid FROM {table} "
+        'WHERE {tags} @> \'{{"en": ["tag 42"]}}\' LIMIT 10',
+    ),
+    (
+        "tag count",
+        "SELECT count(*) FROM {table} "
+        'WHERE {tags} @> \'{{"en": ["tag 42"]}}\'',
+    ),
+]
+
+
+def _bench_json_table(kind: str, rows: int) -> str:
+    """Temporary copy of a listing table storing its fields as `kind`."""
+    table = f"bench_{kind}"
+    tags = "(tags::jsonb)" if kind == "json" else "tags"
+    for statement in (
+        f"CREATE TEMPORARY TABLE {table} (uuid uuid PRIMARY KEY, "
+        f"title {kind} NOT NULL, tags {kind} NOT NULL, "
+        "updated_at timestamp NOT NULL)",
+        f"INSERT INTO {table} SELECT gen_random_uuid(), "
+        f"json_build_object('en', 'title ' || n, 'ar', 'title ' || n)::{kind}, "
+        "json_build_object('en', json_build_array('tag ' || n % 1000), "
+        f"'ar', json_build_array('tag ' || n % 1000))::{kind}, "
+        "now() - make_interval(mins => n) "
+        "FROM generate_series(1, :rows) AS n",
+        f"CREATE INDEX ON {table} (updated_at)",
+        f"CREATE INDEX ON {table} USING gin "
+        "((title ->> 'en') gin_trgm_ops)",
+        f"CREATE INDEX ON {table} USING gin ({tags} jsonb_path_ops)",
+        f"ANALYZE {table}",
+    ):
+        db.session.execute(text(statement), {"rows": rows})
+    return table
+
+
+@bench_cli.command("jsonb")
+@click.option("--rows", default=50_000, help="Rows of each table.")
+@click.option("--runs", default=5, help="Runs of each query (best kept).")
+def bench_jsonb(rows: int, runs: int) -> None:
+    """
+    Time listing and search queries on JSON and on JSONB.
+
+    Both tables are temporary copies with the indexes of the models
+    (trigram on `title ->> 'en'`, `jsonb_path_ops` on the tags, cast to
+    JSONB on JSON), rolled back afterwards.
+    """
+    try:
+        timings = {}
+        for kind in ("json", "jsonb"):
+            table = _bench_json_table(kind, rows)
+            tags = "tags::jsonb" if kind == "json" else "tags"
+            for label, query in BENCH_JSON_QUERIES:
+                statement = text(query.format(table=table, tags=tags))
+                best = float("inf")
+                for _ in range(runs):
+                    start = perf_counter()
+                    db.session.execute(statement).all()
+                    best = min(best, perf_counter() - start)
+                timings[label, kind] = best
+    finally:
+        db.session.rollback()
+
+    click.echo(f"{'query':<14} {'json':>10} {'jsonb':>10}")
+    for label, _ in BENCH_JSON_QUERIES:
+        click.echo(
+            f"{label:<14} {timings[label, 'json'] * 1000:>7.1f} ms "
+            f"{timings[label, 'jsonb'] * 1000:>7.1f} ms"
+        )
+
+
+def _migrate(
+    migration: Callable[[Operations], None], sql: bool, done: Callable
+) -> bool:
+    """
+    Run a migration of `utils.schema_migrations` in one transaction.
+
+    Args:
+        migration: The upgrade or downgrade to run
+        sql: Print the SQL of the migration instead of running it
+        done: Whether the database is migrated already, given a connection
+
+    Returns:
+        True if the migration ran
+    """
+    if sql:
+        context = MigrationContext.configure(
+            dialect_name="postgresql",
+            opts={
+                "as_sql": True,
+                "output_buffer": click.get_text_stream("stdout"),
+            },
+        )
+        migration(Operations(context))
+        return False
+
+    with db.engine.begin() as connection:
+        if done(connection):
+            click.echo("nothing to migrate")
+            return False
+        migration(Operations(MigrationContext.configure(connection)))
+    return True
+
+
+@schema_cli.command("jsonb")
+@click.option("--sql", is_flag=True, help="Print the SQL, run nothing.")
+@click.option("--downgrade", is_flag=True, help="Convert back to JSON.")
+def schema_jsonb(sql: bool, downgrade: bool) -> None:
+    """Store the multilingual fields as JSONB, in one transaction."""
+    if _migrate(
+        downgrade_jsonb if downgrade else upgrade_jsonb,
+        sql,
+        lambda connection: stored_as(connection, JSONB) != downgrade,
+    ):
+        click.echo(
+            f"multilingual fields stored as {'JSON' if downgrade else 'JSONB'}"
+        )
+
+
+@schema_cli.command("uuid")
+@click.option("--sql", is_flag=True, help="Print the SQL, run nothing.")
+@click.option("--downgrade", is_flag=True, help="Convert back to varchar.")
+def schema_uuid(sql: bool, downgrade: bool) -> None:
+    """Store the UUID keys as native uuid, in one transaction."""
+    if _migrate(
+        downgrade_uuid if downgrade else upgrade_uuid,
+        sql,
+        lambda connection: stored_as(connection, UUID) != downgrade,
+    ):
+        click.echo(f"UUID keys stored as {'varchar' if downgrade else 'uuid'}")
+
+
+@click.command("purge")
+@click.option(
+    "--retention-days",
+    default=Config.PURGE_RETENTION_DAYS,
+    help="Days a soft-deleted row is kept in its table.",
+)
+@click.option(
+    "--batch-size",
+    default=Config.PURGE_BATCH_SIZE,
+    help="Rows archived per transaction.",
+)
+@click.option("--dry-run", is_flag=True, help="Report what would be freed.")
+@with_appcontext
+def purge_expired(retention_days: int, batch_size: int, dry_run: bool) -> None:
+    """Archive the expired soft-deleted rows and delete their files."""
+    if dry_run:
+        report = purge_report(retention_days)
+        click.echo(f"{'table':<18} {'rows':>8} {'files':>8} {'KiB':>10}")
+        for table, freed in report.items():
+            click.echo(
+                f"{table:<18} {freed['rows']:>8} {freed['files']:>8} "
+                f"{freed['bytes'] / 1024:>10.1f}"
+            )
+        click.echo(
+            f"{'total':<18} "
+            f"{sum(freed['rows'] for freed in report.values()):>8} "
+            f"{sum(freed['files'] for freed in report.values()):>8} "
+            f"{sum(freed['bytes'] for freed in report.values()) / 1024:>10.1f}"
+        )
+        return
+
+    start = perf_counter()
+    purged = purge_deleted(retention_days, batch_size)
+    for table, freed in purged.items():
+        if freed["rows"]:
+            click.echo(
+                f"{table}: archived {freed['rows']} rows, "
+                f"deleted {freed['files']} files"
+            )
+    click.echo(f"purged in {perf_counter() - start:.1f} s")
+
+
+def register_commands(app) -> None:
+    """Register CLI command groups with the application."""
+    app.cli.add_command(cache_cli)
+    app.cli.add_command(bench_cli)
+    app.cli.add_command(schema_cli)
+    app.cli.add_command(purge_expired)
@@ -5,9 +5,11 @@ like database connections, session, caching, etc.
 import datetime
 import os
 
+from flask import has_request_context, request
 from flask import session as flask_session
 from flask_caching import Cache
 from flask_migrate import Migrate
+from flask_minify import Minify
 from flask_session import Session
 from flask_sqlalchemy import SQLAlchemy
 
@@ -26,6 +28,20 @@ session = Session()
 # Initialize Flask-Caching globally
 cache = Cache()
 
+
+class EncodedAwareMinify(Minify):
+    """Minify extension skipping responses served precompressed by the cache."""
+
+    def main(self, response):
+        """Minify the response unless its body is already encoded."""
+        if response.content_encoding:
+            return response
+        return super().main(response)
+
+
+# Initialize Flask-Minify globally
+minify = EncodedAwareMinify(html=True, js=True, cssless=True)
+
 API_KEY = Config.API_KEY
 
 
@@ -39,10 +55,23 @@ def init_cache(app):
     cache.init_app(app)
 
 
+def init_minify(app):
+    """Initialize Flask-Minify with the provided Flask app."""
+    minify.init_app(app)
+
+
 def get_locale() -> str:
-    """Get the best language for the user from the session."""
-    lang = flask_session.get("lang", Config.BABEL_DEFAULT_LOCALE)
-    return lang
+    """
+    Get the best language for the user: a supported `?lang=` argument
+    first, then the one stored in the session.
+
+    Pages rendered for a shared (CDN) cache never write the session, the
+    `?lang=` argument alone must select their locale.
+    """
+    lang = request.args.get("lang") if has_request_context() else None
+    if lang in Config.BABEL_SUPPORTED_LOCALES:
+        return lang
+    return flask_session.get("lang", Config.BABEL_DEFAULT_LOCALE)
 
 
 def load_disposable_domains() -> set:
@@ -1,5 +1,6 @@
 """Import all models to ensure they are registered with SQLAlchemy."""
 
+from app.models.archive import archive_tables
 from app.models.contact import Contact
 from app.models.course import Course, CourseMember
 from app.models.member import Member
@@ -10,3 +11,22 @@ from app.models.research import Research
 from app.models.subscriber import Subscriber
 from app.models.team import Team
 from app.models.user import User
+
+# Archive table of each soft-deleting model, the referencing tables first:
+# purging a row cascades to the rows referencing it (see `utils.purge`)
+ARCHIVES = archive_tables(
+    [
+        CourseMember,
+        PodcastMember,
+        Course,
+        Podcast,
+        Member,
+        Project,
+        Research,
+        News,
+        Team,
+        Contact,
+        Subscriber,
+        User,
+    ]
+)
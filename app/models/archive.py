@@ -0,0 +1,38 @@
+"""Archive tables of the purged soft-deleted rows (see `utils.purge`)."""
+
+from typing import Dict, Iterable, Type
+
+from sqlalchemy import Column, DateTime, Table
+
+from app.extensions import db
+
+
+def archive_table(model: Type[db.Model]) -> Table:
+    """
+    Table keeping the purged rows of a model, out of the hot table.
+
+    It has the columns of the model, without the generated search vectors,
+    the indexes and the foreign keys (the referenced rows may be purged
+    too), plus the time each row was archived.
+    """
+    table = model.__table__
+    return Table(
+        f"{table.name}_archive",
+        db.metadata,
+        *[
+            Column(
+                column.name,
+                column.type,
+                primary_key=column.name == "uuid",
+                info=column.info,
+            )
+            for column in table.columns
+            if not column.info.get("search")
+        ],
+        Column("archived_at", DateTime, nullable=False),
+    )
+
+
+def archive_tables(models: Iterable[Type[db.Model]]) -> Dict[Type, Table]:
+    """Archive table of each model, in the order of `models`."""
+    return {model: archive_table(model) for model in models}
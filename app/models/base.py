@@ -1,11 +1,113 @@
 """Base model for all DB models."""
 
 from datetime import datetime, timezone
-from uuid import uuid4
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID, uuid4
 
+from sqlalchemy import (
+    JSON,
+    Index,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    text,
+    update,
+)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import undefer_group
 
 from app.extensions import db
+from config import Config
+from utils.cdn_cache import purge_on_commit, purge_records
+from utils.db_utils import adjust_cached_count
+from utils.entity_cache import (
+    cache_entity,
+    evict_entities,
+    evict_on_commit,
+)
+from utils.serializer import compile_serializer
+
+# Deferred group of the heavy columns only detail pages show
+DETAIL_GROUP = "detail"
+
+# Type of the primary and foreign keys: native `uuid` in PostgreSQL (16
+# bytes), `str` in Python, so URLs, templates and cursors are unchanged
+UUID_KEY = postgresql.UUID(as_uuid=False)
+
+
+def parse_uuid(value: Any) -> Optional[str]:
+    """
+    Canonical string form of a UUID, None if `value` is not one.
+
+    PostgreSQL rejects a malformed UUID compared to a `uuid` column, look
+    ups by such a value must find nothing instead.
+    """
+    try:
+        return str(UUID(str(value)))
+    except ValueError:
+        return None
+
+
+def valid_uuids(values: Iterable[Any]) -> List[str]:
+    """Canonical string form of the UUIDs among `values`."""
+    return [uuid for uuid in map(parse_uuid, values) if uuid]
+
+
+def detail_column(*args, **kwargs):
+    """
+    Column left out of listings, loaded with the rest of a single record.
+
+    Listings only load it when their projection asks for it (see
+    `utils.db_utils.paginate_query`), `get_byuuid` always does.
+    """
+    return db.deferred(db.Column(*args, **kwargs), group=DETAIL_GROUP)
+
+
+def excerpt_expression(field, length: int):
+    """
+    Excerpt of a multilingual field, computed by PostgreSQL.
+
+    Loaded into a `query_expression` of the model by the listings showing
+    cards (see `BaseService.loader_options`), in place of the deferred
+    field: a JSON object with the first `length` characters of the field
+    in each locale.
+
+    Args:
+        field: Expression of the field, a JSON object keyed by locale
+        length: Characters kept of each locale
+    """
+    return func.json_build_object(
+        *[
+            item
+            for locale in Config.BABEL_SUPPORTED_LOCALES
+            for item in (locale, func.left(field[locale].as_string(), length))
+        ],
+        type_=JSON,
+    )
+
+
+def live_index(table: str, name: str, *keys) -> Index:
+    """
+    Partial index of the live (not soft-deleted) rows, for `__table_args__`.
+
+    Every listing filters on `deleted_at IS NULL` and sorts on a few keys,
+    the index serves both. `uuid` ends the key, as the tie-breaker of the
+    keyset pagination.
+
+    Args:
+        table: Name of the table
+        name: Suffix of the index name
+        keys: Sort columns or SQL expressions (`text(...)`)
+    """
+    return Index(
+        f"ix_{table}_live_{name}",
+        *keys,
+        "uuid",
+        postgresql_where=text("deleted_at IS NULL"),
+    )
 
 
 class BaseModel(db.Model):
@@ -13,17 +115,51 @@ class BaseModel(db.Model):
 
     __abstract__ = True  # abstract class (not a table)
 
-    uuid = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid4())
+    uuid = db.Column(UUID_KEY, primary_key=True, default=lambda: str(uuid4()))
+    created_at = db.Column(
+        db.DateTime, default=lambda: datetime.now(timezone.utc)
     )
-    created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
     updated_at = db.Column(
         db.DateTime,
-        default=datetime.now(timezone.utc),
-        onupdate=datetime.now(timezone.utc),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
     )
     deleted_at = db.Column(db.DateTime)
 
+    # Whether `BaseService.get_by_uuid` reads the records from the entity
+    # cache (`utils.entity_cache`), the writes below keep it up to date
+    entity_cache = False
+
+    # Surrogate keys of the CDN copies showing a record, formatted with its
+    # `uuid` (see `utils.cdn_cache.cdn_cache`), purged by the writes below
+    surrogate_keys: Tuple[str, ...] = ()
+
+    def _write_through(self) -> None:
+        """
+        Store the committed record in the entity cache, or evict it, and
+        purge the CDN copies showing it.
+        """
+        purge_records(type(self), [self.uuid])
+        if not self.entity_cache:
+            return
+        if self.deleted_at is not None or inspect(self).was_deleted:
+            evict_entities(type(self), [self.uuid])
+            return
+        # Reload every column in one SELECT, deferred ones included, so
+        # the cached row is the one `get_byuuid` would load
+        db.session.refresh(
+            self,
+            [
+                prop.key
+                for prop in inspect(type(self)).column_attrs
+                if isinstance(prop.columns[0], db.Column)
+                and not prop.columns[0].info.get("search")
+            ],
+        )
+        cache_entity(
+            type(self), self.uuid, self.__serializer__(self, None, False)
+        )
+
     def create(self, **kwargs) -> None:
         """Create a record in the database."""
         for key, value in kwargs.items():
@@ -34,25 +170,180 @@ class BaseModel(db.Model):
         except IntegrityError as e:
             db.session.rollback()
             raise e
+        adjust_cached_count(type(self), 1)
+        self._write_through()
 
     def update(self, **kwargs) -> None:
         """Update a record in the database."""
         for key, value in kwargs.items():
             setattr(self, key, value)
         db.session.commit()
+        self._write_through()
 
     def delete(self, permanent=False) -> None:
         """Delete a record from the database."""
+        was_live = self.deleted_at is None
         if permanent:
             db.session.delete(self)
         else:
             self.deleted_at = datetime.now(timezone.utc)
         db.session.commit()
+        if was_live:
+            adjust_cached_count(type(self), -1)
+        self._write_through()
 
     def restore(self) -> None:
         """Restore a soft-deleted record."""
+        was_deleted = self.deleted_at is not None
         self.deleted_at = None
         db.session.commit()
+        if was_deleted:
+            adjust_cached_count(type(self), 1)
+        self._write_through()
+
+    @classmethod
+    def _commit_bulk(cls, statement, returning: bool = False) -> Any:
+        """
+        Execute a bulk statement and commit it, in one transaction.
+
+        Returns:
+            The rows of a RETURNING statement, else the number of rows hit
+        """
+        try:
+            result = db.session.execute(statement)
+            outcome = result.all() if returning else result.rowcount
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            raise e
+        return outcome
+
+    @classmethod
+    def bulk_create(cls, rows: List[Dict[str, Any]]) -> List[str]:
+        """
+        Create many records with a single multi-row INSERT.
+
+        Args:
+            rows: Column values of each record
+
+        Returns:
+            The UUIDs of the created records, in the order of `rows`
+        """
+        if not rows:
+            return []
+        now = datetime.now(timezone.utc)
+        values = [
+            {"uuid": str(uuid4()), "created_at": now, "updated_at": now, **row}
+            for row in rows
+        ]
+        cls._commit_bulk(insert(cls).values(values))
+        adjust_cached_count(cls, len(values))
+        uuids = [row["uuid"] for row in values]
+        purge_records(cls, uuids)
+        return uuids
+
+    @classmethod
+    def bulk_update(cls, uuids: List[str], **kwargs) -> int:
+        """
+        Set the same values on many live records with a single UPDATE.
+
+        Returns:
+            The number of records updated
+        """
+        uuids = valid_uuids(uuids)
+        if not uuids:
+            return 0
+        statement = (
+            update(cls)
+            .where(cls.uuid.in_(uuids), cls.deleted_at.is_(None))
+            .values(
+                {
+                    **kwargs,
+                    "updated_at": kwargs.get(
+                        "updated_at", datetime.now(timezone.utc)
+                    ),
+                }
+            )
+            .execution_options(synchronize_session=False)
+        )
+        evict_on_commit(cls, uuids)
+        purge_on_commit(cls, uuids)
+        return cls._commit_bulk(statement)
+
+    @classmethod
+    def bulk_soft_delete(cls, uuids: List[str]) -> int:
+        """
+        Soft-delete many records with a single UPDATE.
+
+        Returns:
+            The number of records deleted (already deleted ones excluded)
+        """
+        uuids = valid_uuids(uuids)
+        if not uuids:
+            return 0
+        statement = (
+            update(cls)
+            .where(cls.uuid.in_(uuids), cls.deleted_at.is_(None))
+            .values(deleted_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        evict_on_commit(cls, uuids)
+        purge_on_commit(cls, uuids)
+        deleted = cls._commit_bulk(statement)
+        adjust_cached_count(cls, -deleted)
+        return deleted
+
+    @classmethod
+    def bulk_restore(cls, uuids: List[str]) -> int:
+        """
+        Restore many soft-deleted records with a single UPDATE.
+
+        Returns:
+            The number of records restored
+        """
+        uuids = valid_uuids(uuids)
+        if not uuids:
+            return 0
+        statement = (
+            update(cls)
+            .where(cls.uuid.in_(uuids), cls.deleted_at.isnot(None))
+            .values(deleted_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        evict_on_commit(cls, uuids)
+        purge_on_commit(cls, uuids)
+        restored = cls._commit_bulk(statement)
+        adjust_cached_count(cls, restored)
+        return restored
+
+    @classmethod
+    def bulk_delete(cls, *criteria) -> int:
+        """
+        Permanently delete the records matching `criteria`, in one DELETE.
+
+        Args:
+            criteria: SQLAlchemy filter expressions (e.g. `cls.uuid.in_(...)`)
+
+        Returns:
+            The number of records deleted
+
+        Raises:
+            ValueError: If no criteria are given, which would delete every
+                        record of the table
+        """
+        if not criteria:
+            raise ValueError(f"bulk_delete of {cls.__name__} without criteria")
+        statement = (
+            delete(cls)
+            .where(*criteria)
+            .returning(cls.uuid, cls.deleted_at)
+            .execution_options(synchronize_session=False)
+        )
+        rows = cls._commit_bulk(statement, returning=True)
+        adjust_cached_count(cls, -sum(row.deleted_at is None for row in rows))
+        evict_entities(cls, [row.uuid for row in rows])
+        purge_records(cls, [row.uuid for row in rows])
+        return len(rows)
 
     @classmethod
     def get_all(cls) -> list:
@@ -60,9 +351,26 @@ class BaseModel(db.Model):
         return cls.query.filter_by(deleted_at=None).all()
 
     @classmethod
-    def get_byuuid(cls, uuid):
-        """Get a record from the database by its ID."""
-        return cls.query.filter_by(uuid=uuid, deleted_at=None).first()
+    def get_byuuid(cls, uuid, deleted: bool = False):
+        """
+        Get a record from the database by its ID.
+
+        Args:
+            uuid: The UUID of the record
+            deleted: Look up a soft-deleted record instead of a live one
+        """
+        if not parse_uuid(uuid):
+            return None
+        return (
+            cls.query.options(undefer_group(DETAIL_GROUP))
+            .filter_by(uuid=uuid)
+            .filter(
+                cls.deleted_at.isnot(None)
+                if deleted
+                else cls.deleted_at.is_(None)
+            )
+            .first()
+        )
 
     @classmethod
     def get_by(cls, **kwargs):
@@ -74,13 +382,21 @@ class BaseModel(db.Model):
         """Get all records from the database by a given attribute."""
         return cls.query.filter_by(**kwargs, deleted_at=None).all()
 
-    def to_dict(self):
-        """Convert the model to a dictionary."""
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+    def to_dict(self, locale: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Convert the model to a dictionary, without the unloaded columns.
+
+        Args:
+            locale: Project the multilingual fields to this locale
+        """
+        return self.__serializer__(self, locale)
 
     def __repr__(self):
         """Return a string representation of the model."""
         return f"<{self.__class__.__name__} {self.uuid}>"
+
+
+@event.listens_for(BaseModel, "mapper_configured", propagate=True)
+def _compile_serializer(mapper, cls) -> None:
+    """Compile the `to_dict` serializer of each model once it is mapped."""
+    cls.__serializer__ = staticmethod(compile_serializer(mapper))
@@ -1,24 +1,35 @@
 """Course model and Association Table for many-to-many Relationship between Course and Member."""
 
+from sqlalchemy.dialects.postgresql import JSONB
+
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import UUID_KEY, BaseModel, live_index
+from app.models.search import containment_indexes, trigram_indexes
 
 
 class Course(BaseModel):
     """Course model."""
 
     __tablename__ = "courses"
+    __table_args__ = (
+        live_index("courses", "updated_at", "updated_at"),
+        *trigram_indexes("courses", "title"),
+        *containment_indexes("courses", "course_name", "tags"),
+    )
 
-    title = db.Column(db.JSON, nullable=False)
-    course_name = db.Column(db.JSON, nullable=False)
+    entity_cache = True
+    surrogate_keys = ("knowledge-hub",)
+
+    title = db.Column(JSONB, nullable=False)
+    course_name = db.Column(JSONB, nullable=False)
     date = db.Column(db.Date, nullable=True)
-    description = db.Column(db.JSON, nullable=False)
+    description = db.Column(JSONB, nullable=False)
     url = db.Column(db.String(255), nullable=True)
     members = db.relationship(
         "Member", secondary="course_members", backref="courses", lazy=True
     )
-    tags = db.Column(db.JSON, nullable=False)
-    image = db.Column(db.String(255), nullable=True)
+    tags = db.Column(JSONB, nullable=False)
+    image = db.Column(db.String(255), nullable=True, info={"file": True})
 
 
 # Association Table for many-to-many Relationship between Course and Member
@@ -27,13 +38,15 @@ class CourseMember(BaseModel):
 
     __tablename__ = "course_members"
 
+    surrogate_keys = ("knowledge-hub",)
+
     course_uuid = db.Column(
-        db.String(36),
+        UUID_KEY,
         db.ForeignKey("courses.uuid", ondelete="CASCADE"),
         primary_key=True,
     )
     member_uuid = db.Column(
-        db.String(36),
+        UUID_KEY,
         db.ForeignKey("members.uuid", ondelete="CASCADE"),
         primary_key=True,
     )
@@ -1,15 +1,25 @@
 """Member model."""
 
+from sqlalchemy.dialects.postgresql import JSONB
+
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, live_index
+from app.models.search import trigram_indexes
 
 
 class Member(BaseModel):
     """Member model."""
 
     __tablename__ = "members"
+    __table_args__ = (
+        live_index("members", "updated_at", "updated_at"),
+        *trigram_indexes("members", "name"),
+    )
+
+    entity_cache = True
+    surrogate_keys = ("knowledge-hub",)
 
-    name = db.Column(db.JSON, nullable=False)
+    name = db.Column(JSONB, nullable=False)
     email = db.Column(db.String(255), unique=True, nullable=False)
-    image = db.Column(db.String(255), nullable=True)
-    university_department = db.Column(db.JSON, nullable=True)
+    image = db.Column(db.String(255), nullable=True, info={"file": True})
+    university_department = db.Column(JSONB, nullable=True)
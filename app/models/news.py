@@ -1,16 +1,30 @@
 """News model."""
 
+from sqlalchemy.dialects.postgresql import JSONB
+
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, live_index
+from app.models.search import search_indexes, search_vector
 
 
 class News(BaseModel):
     """News model."""
 
     __tablename__ = "news"
+    __table_args__ = (
+        live_index("news", "updated_at", "updated_at"),
+        *search_indexes("news"),
+    )
+
+    entity_cache = True
+    surrogate_keys = ("news", "news:{uuid}")
 
-    title = db.Column(db.JSON, nullable=False)
+    title = db.Column(JSONB, nullable=False)
     date = db.Column(db.Date, nullable=True)
-    image = db.Column(db.String(255), nullable=True)
-    description = db.Column(db.JSON, nullable=False)
+    image = db.Column(db.String(255), nullable=True, info={"file": True})
+    description = db.Column(JSONB, nullable=False)
     url_redirect = db.Column(db.String(255), nullable=True)
+
+    # Full-text search (see utils.db_utils.full_text_search)
+    search_en = search_vector("en", "title", "description")
+    search_ar = search_vector("ar", "title", "description")
@@ -1,24 +1,35 @@
 """Podcast model and association table for many-to-many relationship between Podcast and Member."""
 
+from sqlalchemy.dialects.postgresql import JSONB
+
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import UUID_KEY, BaseModel, live_index
+from app.models.search import containment_indexes, trigram_indexes
 
 
 class Podcast(BaseModel):
     """Podcast model."""
 
     __tablename__ = "podcasts"
+    __table_args__ = (
+        live_index("podcasts", "updated_at", "updated_at"),
+        *trigram_indexes("podcasts", "title"),
+        *containment_indexes("podcasts", "podcast_name", "tags"),
+    )
 
-    title = db.Column(db.JSON, nullable=False)
-    podcast_name = db.Column(db.JSON, nullable=False)
+    entity_cache = True
+    surrogate_keys = ("knowledge-hub",)
+
+    title = db.Column(JSONB, nullable=False)
+    podcast_name = db.Column(JSONB, nullable=False)
     date = db.Column(db.Date, nullable=True)
-    description = db.Column(db.JSON, nullable=False)
+    description = db.Column(JSONB, nullable=False)
     url = db.Column(db.String(255), nullable=True)
     members = db.relationship(
         "Member", secondary="podcast_members", backref="podcasts", lazy=True
     )
-    tags = db.Column(db.JSON, nullable=False)
-    image = db.Column(db.String(255), nullable=True)
+    tags = db.Column(JSONB, nullable=False)
+    image = db.Column(db.String(255), nullable=True, info={"file": True})
 
 
 # Association Table for many-to-many Relationship between Podcast and Member
@@ -27,13 +38,15 @@ class PodcastMember(BaseModel):
 
     __tablename__ = "podcast_members"
 
+    surrogate_keys = ("knowledge-hub",)
+
     podcast_uuid = db.Column(
-        db.String(36),
+        UUID_KEY,
         db.ForeignKey("podcasts.uuid", ondelete="CASCADE"),
         primary_key=True,
     )
     member_uuid = db.Column(
-        db.String(36),
+        UUID_KEY,
         db.ForeignKey("members.uuid", ondelete="CASCADE"),
         primary_key=True,
     )
@@ -1,23 +1,44 @@
 """Project model."""
 
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import JSONB
+
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, detail_column, live_index
+from app.models.search import trigram_indexes
 
 
 class Project(BaseModel):
     """Project model."""
 
     __tablename__ = "projects"
+    __table_args__ = (
+        live_index("projects", "updated_at", "updated_at"),
+        live_index(
+            "projects",
+            "completion",
+            text("COALESCE(date_of_completion, created_at)"),
+        ),
+        *trigram_indexes("projects", "title"),
+    )
+
+    entity_cache = True
+    surrogate_keys = ("projects", "project:{uuid}")
 
-    title = db.Column(db.JSON, nullable=False)
-    author = db.Column(db.JSON, nullable=False)
+    title = db.Column(JSONB, nullable=False)
+    author = db.Column(JSONB, nullable=False)
     date_of_completion = db.Column(db.Date, nullable=True)
     status = db.Column(
         db.Enum("ongoing", "completed", name="project_status"), nullable=False
     )
-    content = db.Column(
-        db.ARRAY(db.JSON), nullable=True
+    content = detail_column(
+        db.ARRAY(db.JSON), nullable=True, info={"file": True}
     )  # ARRAY of JSON objects
-    tags = db.Column(db.JSON, nullable=True)
-    hero_image = db.Column(db.String(255), nullable=True)
-    testimonials = db.Column(db.ARRAY(db.JSON), nullable=True)
+    tags = db.Column(JSONB, nullable=True)
+    hero_image = db.Column(db.String(255), nullable=True, info={"file": True})
+    testimonials = detail_column(
+        db.ARRAY(db.JSON), nullable=True, info={"file": True}
+    )
+
+    # Content excerpt of the cards (see `excerpt_expression`)
+    excerpt = db.query_expression()
@@ -1,19 +1,33 @@
 """Research models."""
 
+from sqlalchemy.dialects.postgresql import JSONB
+
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, detail_column, live_index
+from app.models.search import containment_indexes, trigram_indexes
 
 
 class Research(BaseModel):
     """Research model."""
 
     __tablename__ = "research"
+    __table_args__ = (
+        live_index("research", "updated_at", "updated_at"),
+        *trigram_indexes("research", "title"),
+        *containment_indexes("research", "tags"),
+    )
+
+    entity_cache = True
+    surrogate_keys = ("researches", "knowledge-hub", "research:{uuid}")
 
-    title = db.Column(db.JSON, nullable=False)
-    author = db.Column(db.JSON, nullable=False)
+    title = db.Column(JSONB, nullable=False)
+    author = db.Column(JSONB, nullable=False)
     date_of_completion = db.Column(db.Date, nullable=True)
-    content = db.Column(db.JSON, nullable=True)
-    tags = db.Column(db.JSON, nullable=False)
-    hero_image = db.Column(db.String(255), nullable=True)
-    images = db.Column(db.JSON, nullable=True)
-    testimonials = db.Column(db.ARRAY(db.JSON), nullable=True)
+    content = detail_column(JSONB, nullable=True)
+    tags = db.Column(JSONB, nullable=False)
+    hero_image = db.Column(db.String(255), nullable=True, info={"file": True})
+    images = detail_column(JSONB, nullable=True, info={"file": True})
+    testimonials = detail_column(db.ARRAY(db.JSON), nullable=True)
+
+    # Content excerpt of the cards (see `excerpt_expression`)
+    excerpt = db.query_expression()
@@ -0,0 +1,103 @@
+"""Search columns and indexes over the multilingual JSONB fields."""
+
+from typing import Tuple
+
+from sqlalchemy import DDL, Computed, Index, event, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from app.extensions import db
+from config import Config
+
+# Weights of the fields of a search vector, in the order they are given
+SEARCH_WEIGHTS = "ABCD"
+
+# Trigram indexes need the pg_trgm extension
+event.listen(
+    db.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        dialect="postgresql"
+    ),
+)
+
+
+def search_vector(locale: str, *fields: str):
+    """
+    Generated `tsvector` column indexing the `locale` text of JSON fields.
+
+    PostgreSQL computes it on every write, earlier fields weigh more in the
+    ranking. The column is deferred so regular queries never load it.
+
+    Args:
+        locale: Key of the JSON fields to index (`en` or `ar`)
+        fields: Names of the multilingual JSON columns to index
+    """
+    config = Config.SEARCH_CONFIGS[locale]
+    expression = " || ".join(
+        f"setweight(to_tsvector('{config}'::regconfig, "
+        f"coalesce({field} ->> '{locale}', '')), '{weight}')"
+        for field, weight in zip(fields, SEARCH_WEIGHTS)
+    )
+    return db.deferred(
+        db.Column(
+            TSVECTOR,
+            Computed(expression, persisted=True),
+            info={"search": True},
+        )
+    )
+
+
+def search_indexes(table: str) -> Tuple[Index, ...]:
+    """GIN indexes of the search vectors of a table, for `__table_args__`."""
+    return tuple(
+        Index(
+            f"ix_{table}_search_{locale}",
+            f"search_{locale}",
+            postgresql_using="gin",
+        )
+        for locale in Config.SEARCH_CONFIGS
+    )
+
+
+def trigram_indexes(table: str, *fields: str) -> Tuple[Index, ...]:
+    """
+    Trigram GIN indexes of the per-locale text of JSON fields.
+
+    They serve the `ILIKE '%term%'` substring matches and the similarity
+    ordering of `utils.db_utils.substring_search`, for `__table_args__`.
+
+    Args:
+        table: Name of the table
+        fields: Names of the multilingual JSON columns to index
+    """
+    return tuple(
+        Index(
+            f"ix_{table}_{field}_{locale}_trgm",
+            text(f"({field} ->> '{locale}') gin_trgm_ops"),
+            postgresql_using="gin",
+        )
+        for field in fields
+        for locale in Config.SEARCH_CONFIGS
+    )
+
+
+def containment_indexes(table: str, *fields: str) -> Tuple[Index, ...]:
+    """
+    `jsonb_path_ops` GIN indexes of JSONB fields, for `__table_args__`.
+
+    They serve the JSONB containment (`@>`) filters of
+    `utils.db_utils.json_contains`, for any locale.
+
+    Args:
+        table: Name of the table
+        fields: Names of the JSONB columns to index
+    """
+    return tuple(
+        Index(
+            f"ix_{table}_{field}_contains",
+            field,
+            postgresql_using="gin",
+            postgresql_ops={field: "jsonb_path_ops"},
+        )
+        for field in fields
+    )
@@ -1,12 +1,13 @@
 """Subscriber model."""
 
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, live_index
 
 
 class Subscriber(BaseModel):
     """Subscriber model."""
 
     __tablename__ = "subscribers"
+    __table_args__ = (live_index("subscribers", "updated_at", "updated_at"),)
 
     email = db.Column(db.String(255), unique=True, nullable=False)
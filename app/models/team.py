@@ -1,18 +1,111 @@
 """Team model."""
 
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, live_index, valid_uuids
+from app.models.search import trigram_indexes
+from utils.cdn_cache import purge_on_commit
+from utils.entity_cache import evict_on_commit
 
 
 class Team(BaseModel):
     """Team model."""
 
     __tablename__ = "teams"
+    __table_args__ = (
+        live_index("teams", "order", "order"),
+        *trigram_indexes("teams", "name"),
+    )
+
+    entity_cache = True
+    surrogate_keys = ("team",)
 
-    name = db.Column(db.JSON, nullable=False)
+    name = db.Column(JSONB, nullable=False)
     order = db.Column(db.Integer, nullable=False, default=1)
-    role = db.Column(db.JSON, nullable=False)
-    bio = db.Column(db.JSON, nullable=False)
-    socials = db.Column(db.JSON, nullable=True)
-    image = db.Column(db.String(255), nullable=True)
+    role = db.Column(JSONB, nullable=False)
+    bio = db.Column(JSONB, nullable=False)
+    socials = db.Column(JSONB, nullable=True)
+    image = db.Column(db.String(255), nullable=True, info={"file": True})
     email = db.Column(db.String(255), nullable=True)
+
+    @classmethod
+    def max_order(cls) -> int:
+        """Highest order of the live team members, 0 if there are none."""
+        return db.session.scalar(
+            select(func.coalesce(func.max(cls.order), 0)).where(
+                cls.deleted_at.is_(None)
+            )
+        )
+
+    @classmethod
+    def shift_order(
+        cls, start: int, delta: int, end: Optional[int] = None
+    ) -> None:
+        """
+        Shift the order of a range of live team members with one UPDATE.
+
+        The statement joins the transaction of the session, the caller's
+        commit (create, update or delete of the moved member) applies both.
+
+        Args:
+            start: First order to shift
+            delta: Amount added to each order (1 opens a slot at `start`,
+                   -1 closes the one before it)
+            end: Last order to shift, unbounded if None
+        """
+        criteria = [cls.order >= start, cls.deleted_at.is_(None)]
+        if end is not None:
+            criteria.append(cls.order <= end)
+        shifted = db.session.scalars(
+            update(cls)
+            .where(*criteria)
+            .values(order=cls.order + delta)
+            .returning(cls.uuid)
+            .execution_options(synchronize_session=False)
+        ).all()
+        evict_on_commit(cls, shifted)
+        purge_on_commit(cls, shifted)
+
+    @classmethod
+    def reorder(cls, uuids: List[str]) -> int:
+        """
+        Rewrite the order of team members with one UPDATE.
+
+        The members take the orders they already hold, redistributed in
+        the sequence of `uuids`, so reordering one page of the list leaves
+        the other pages in place.
+
+        Args:
+            uuids: UUIDs of the live members, in their new order
+
+        Returns:
+            The number of members reordered
+        """
+        valid = valid_uuids(uuids)
+        if len(valid) != len(uuids) or len(set(valid)) != len(valid):
+            return 0
+        uuids = valid
+        orders = db.session.scalars(
+            select(cls.order)
+            .where(cls.uuid.in_(uuids), cls.deleted_at.is_(None))
+            .order_by(cls.order)
+        ).all()
+        if len(orders) != len(uuids):
+            return 0
+        statement = (
+            update(cls)
+            .where(cls.uuid.in_(uuids))
+            .values(
+                order=case(dict(zip(uuids, orders)), value=cls.uuid),
+                updated_at=datetime.now(timezone.utc),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        evict_on_commit(cls, uuids)
+        purge_on_commit(cls, uuids)
+        return cls._commit_bulk(statement)
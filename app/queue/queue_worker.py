@@ -2,8 +2,10 @@ import logging
 import signal
 import sys
 
+from app import create_app
 from app.queue.queue_service import QueueService
 from app.services.mailing import EmailService
+from utils.purge import PURGE_TASK, purge_processor, schedule_purge
 
 # Initialize services
 email_service = EmailService()
@@ -29,6 +31,12 @@ def main():
     queue_service.register_task_processor(
         "send_email", email_service.send_email
     )
+    queue_service.register_task_processor(
+        PURGE_TASK, purge_processor(create_app())
+    )
+
+    # Archive the expired soft-deleted rows periodically
+    schedule_purge(queue_service)
 
     logging.info("Starting task queue worker...")
     queue_service.process_queue()
@@ -5,10 +5,11 @@ Course Service Module
 from typing import Any, Dict, List, Optional
 
 from marshmallow import ValidationError
+from sqlalchemy.orm import selectinload
 
 from app.models import Course, CourseMember
+from app.models.base import valid_uuids
 from app.schemas import CourseSchema
-from utils.db_utils import search_by_multilang_field
 from utils.form_utils import parse_nested_field
 from utils.service_base import BaseService
 
@@ -16,6 +17,9 @@ from utils.service_base import BaseService
 class CourseService(BaseService):
     """Course service class."""
 
+    # The knowledge hub cards show the members of each course
+    loader_options = {"cards": [selectinload(Course.members)]}
+
     def __init__(self, page_size: int = 10):
         """Initialize course service."""
         super().__init__(Course, CourseSchema, page_size)
@@ -104,11 +108,12 @@ class CourseService(BaseService):
             return False
 
         # Add members to the course
-        for member_uuid in member_uuids:
-            course_member = CourseMember(
-                course_uuid=course_uuid, member_uuid=member_uuid
-            )
-            course_member.create()
+        CourseMember.bulk_create(
+            [
+                dict(course_uuid=course_uuid, member_uuid=member_uuid)
+                for member_uuid in valid_uuids(member_uuids)
+            ]
+        )
 
         return True
 
@@ -130,78 +135,27 @@ class CourseService(BaseService):
             return False
 
         # Remove members from the course
-        for member_uuid in member_uuids:
-            course_member = CourseMember.query.filter_by(
-                course_uuid=course_uuid, member_uuid=member_uuid
-            ).first()
-            if course_member:
-                course_member.delete(permanent=True)
-                self.file_manager.delete_file(course_member.image)
+        CourseMember.bulk_delete(
+            CourseMember.course_uuid == course_uuid,
+            CourseMember.member_uuid.in_(valid_uuids(member_uuids)),
+        )
 
         return True
 
-    def search_courses_by_title(self, title: str) -> Dict[str, Any]:
+    def search_courses_by_title(
+        self, title: str, page: int = 1
+    ) -> Dict[str, Any]:
         """
         Search for courses by title.
 
         Args:
             title: The search term to look for in the title field.
+            page: Page number, used when listing with an empty title.
 
         Returns:
             Dictionary containing search results and pagination metadata.
         """
-        return search_by_multilang_field(self.model_class, "title", title)
-
-    def process_courses_data(
-        self, result_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """
-        Process course data for display.
-
-        Args:
-            result_data: Dictionary containing course data.
-
-        Returns:
-            Dictionary containing processed course data.
-        """
-        unique_courses = {}
-        # Extract all unique tags
-        all_tags = {"en": set(), "ar": set()}
-
-        for course in result_data["data"]:
-            course_uuid = course["uuid"]
-            course_name_en = course["course_name"]["en"]
-            course_name_ar = course["course_name"]["ar"]
-
-            # Store unique courses with their UUIDs
-            if course_name_en not in unique_courses.get("en", {}):
-                if "en" not in unique_courses:
-                    unique_courses["en"] = {}
-                unique_courses["en"][course_name_en] = course_uuid
-
-            if course_name_ar not in unique_courses.get("ar", {}):
-                if "ar" not in unique_courses:
-                    unique_courses["ar"] = {}
-                unique_courses["ar"][course_name_ar] = course_uuid
-
-            # Collect tags from each language
-            for tag in course["tags"].get("en", []):
-                all_tags["en"].add(tag)
-
-            for tag in course["tags"].get("ar", []):
-                all_tags["ar"].add(tag)
-
-        # Convert sets to sorted lists
-        unique_tags = {
-            "en": sorted(list(all_tags["en"])),
-            "ar": sorted(list(all_tags["ar"])),
-        }
-
-        # Add the processed data to the result
-        result_data["unique_courses"] = unique_courses
-        result_data["unique_tags"] = unique_tags
-
-        return result_data
+        return self.substring_search(["title"], title, page)
 
     def validate_form_data(
         self, form_data: Dict[str, Any], files: Dict[str, Any]
@@ -8,7 +8,6 @@ from marshmallow import ValidationError
 
 from app.models import Member
 from app.schemas import MemberSchema
-from utils.db_utils import search_by_multilang_field
 from utils.form_utils import parse_nested_field
 from utils.service_base import BaseService
 
@@ -86,17 +85,20 @@ class MemberService(BaseService):
         except ValidationError as error:
             raise ValidationError(error.messages) from error
 
-    def search_members_by_name(self, name: str) -> Dict[str, Any]:
+    def search_members_by_name(
+        self, name: str, page: int = 1
+    ) -> Dict[str, Any]:
         """
         Search for members by name.
 
         Args:
             name: The search term to look for in the name field.
+            page: Page number, used when listing with an empty name.
 
         Returns:
             Dictionary containing search results and pagination metadata.
         """
-        return search_by_multilang_field(self.model_class, "name", name)
+        return self.substring_search(["name"], name, page)
 
     def validate_form_data(
         self, form_data: Dict[str, Any], files: Dict[str, Any]
@@ -4,12 +4,10 @@ News Service Module
 This module provides the business logic for news-related operations.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 from marshmallow import ValidationError
-from sqlalchemy import cast, or_
 
-from app.extensions import db
 from app.models import News
 from app.schemas import NewsSchema
 from utils.compose_i18n import compose_i18n
@@ -67,7 +65,7 @@ class NewsService(BaseService):
         Returns:
             Optional[News]: The updated news instance.
         """
-        news = self.model_class.query.filter_by(uuid=uuid).first()
+        news = self.model_class.get_byuuid(uuid)
         if not news:
             return None
 
@@ -93,19 +91,6 @@ class NewsService(BaseService):
         except ValidationError as error:
             raise ValidationError(error.messages) from error
 
-    def search_news(self, query: str) -> List[Dict[str, Any]]:
+    def search_news(self, query: str, page: int = 1) -> Dict[str, Any]:
         """Search news by title or description."""
-        news_list = [
-            t.to_dict()
-            for t in self.model_class.query.filter(
-                or_(
-                    cast(self.model_class.title, db.String).ilike(
-                        f"%{query}%"
-                    ),
-                    cast(self.model_class.description, db.String).ilike(
-                        f"%{query}%"
-                    ),
-                )
-            )
-        ]
-        return news_list
+        return self.search(query, page)
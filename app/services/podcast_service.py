@@ -5,10 +5,11 @@ Podcast Service Module
 from typing import Any, Dict, List, Optional
 
 from marshmallow import ValidationError
+from sqlalchemy.orm import selectinload
 
 from app.models import Podcast, PodcastMember
+from app.models.base import valid_uuids
 from app.schemas import PodcastSchema
-from utils.db_utils import search_by_multilang_field
 from utils.form_utils import parse_nested_field
 from utils.service_base import BaseService
 
@@ -16,6 +17,9 @@ from utils.service_base import BaseService
 class PodcastService(BaseService):
     """Podcast service class."""
 
+    # The knowledge hub cards show the members of each podcast
+    loader_options = {"cards": [selectinload(Podcast.members)]}
+
     def __init__(self, page_size: int = 10):
         """Initialize podcast service."""
         super().__init__(Podcast, PodcastSchema, page_size)
@@ -104,11 +108,12 @@ class PodcastService(BaseService):
             return False
 
         # Add members to the podcast
-        for member_uuid in member_uuids:
-            podcast_member = PodcastMember(
-                podcast_uuid=podcast_uuid, member_uuid=member_uuid
-            )
-            podcast_member.create()
+        PodcastMember.bulk_create(
+            [
+                dict(podcast_uuid=podcast_uuid, member_uuid=member_uuid)
+                for member_uuid in valid_uuids(member_uuids)
+            ]
+        )
 
         return True
 
@@ -130,26 +135,27 @@ class PodcastService(BaseService):
             return False
 
         # Remove members from the podcast
-        for member_uuid in member_uuids:
-            podcast_member = PodcastMember.query.filter_by(
-                podcast_uuid=podcast_uuid, member_uuid=member_uuid
-            ).first()
-            if podcast_member:
-                podcast_member.delete(permanent=True)
+        PodcastMember.bulk_delete(
+            PodcastMember.podcast_uuid == podcast_uuid,
+            PodcastMember.member_uuid.in_(valid_uuids(member_uuids)),
+        )
 
         return True
 
-    def search_podcasts_by_title(self, title: str) -> Dict[str, Any]:
+    def search_podcasts_by_title(
+        self, title: str, page: int = 1
+    ) -> Dict[str, Any]:
         """
         Search for podcasts by title.
 
         Args:
             title: The search term to look for in the title field.
+            page: Page number, used when listing with an empty title.
 
         Returns:
             Dictionary containing search results and pagination metadata.
         """
-        return search_by_multilang_field(self.model_class, "title", title)
+        return self.substring_search(["title"], title, page)
 
     def validate_form_data(
         self, form_data: Dict[str, Any], files: Dict[str, Any]
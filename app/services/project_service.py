@@ -8,16 +8,26 @@ from datetime import date
 from typing import Any, Dict, List, Optional
 
 from marshmallow import ValidationError
+from sqlalchemy.orm import with_expression
 
 from app.models import Project
+from app.models.base import excerpt_expression
 from app.schemas import ProjectSchema
-from utils.db_utils import search_by_multilang_field
 from utils.service_base import BaseService
 
 
 class ProjectService(BaseService):
     """Project service class."""
 
+    # The cards show an excerpt of the first content block, not all of it
+    loader_options = {
+        "cards": [
+            with_expression(
+                Project.excerpt, excerpt_expression(Project.content[1], 300)
+            )
+        ]
+    }
+
     def __init__(self, page_size: int = 3):
         """Initialize project service."""
         super().__init__(Project, ProjectSchema, page_size)
@@ -92,21 +102,21 @@ class ProjectService(BaseService):
             return True
         return False
 
-    def get_project_by_uuid(self, uuid: str) -> Optional[Project]:
+    def get_project_by_uuid(self, uuid: str) -> Optional[Dict[str, Any]]:
         """
-        Retrieve a project by its UUID.
+        Retrieve a project by its UUID, ready for rendering.
 
         Args:
             uuid (str): The UUID of the project to retrieve.
 
         Returns:
-            Optional[Project]: The project instance if found, otherwise None.
+            Optional[Dict[str, Any]]: The project data with its tags joined,
+            if found, otherwise None.
         """
-        project = self.model_class.get_byuuid(uuid)
+        project_data = self.get_by_uuid(uuid)
 
         # Prepare the project data for rendering
-        if project:
-            project_data = project.__dict__
+        if project_data:
             project_data["tags"]["en"] = ", ".join(project_data["tags"]["en"])
             project_data["tags"]["ar"] = ", ".join(project_data["tags"]["ar"])
 
@@ -150,18 +160,21 @@ class ProjectService(BaseService):
             date_of_completion=date_of_completion
         )
 
-    def search_projects_by_title(self, title: str) -> Dict[str, Any]:
+    def search_projects_by_title(
+        self, title: str, page: int = 1
+    ) -> Dict[str, Any]:
         """
         Search for projects by title.
 
         Args:
             title (str): The title to search for.
+            page (int): Page number, used when listing with an empty title.
 
         Returns:
             Dict[str, Any]: Dictionary containing search results and pagination
             metadata.
         """
-        return search_by_multilang_field(self.model_class, "title", title)
+        return self.substring_search(["title"], title, page)
 
     def restore_project(self, uuid: str) -> Optional[Project]:
         """
@@ -173,8 +186,8 @@ class ProjectService(BaseService):
         Returns:
             Optional[Project]: The restored project instance if found, otherwise None.
         """
-        project = self.model_class.get_byuuid(uuid)
-        if project and project.deleted_at:
+        project = self.model_class.get_byuuid(uuid, deleted=True)
+        if project:
             project.restore()
             return project
         return None
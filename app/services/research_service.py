@@ -5,11 +5,12 @@ Research Service Module
 from typing import Any, Dict, List, Optional
 
 from marshmallow import ValidationError
+from sqlalchemy.orm import with_expression
 
 from app.models import Research
+from app.models.base import excerpt_expression
 from app.schemas import ResearchSchema
 from utils.compose_i18n import compose_i18n
-from utils.db_utils import search_by_multilang_field
 from utils.form_utils import parse_nested_field
 from utils.service_base import BaseService
 
@@ -17,6 +18,15 @@ from utils.service_base import BaseService
 class ResearchService(BaseService):
     """Research service class."""
 
+    # The cards show an excerpt of the content, not all of it
+    loader_options = {
+        "cards": [
+            with_expression(
+                Research.excerpt, excerpt_expression(Research.content, 100)
+            )
+        ]
+    }
+
     def __init__(self, page_size: int = 10):
         """Initialize research service."""
         super().__init__(Research, ResearchSchema, page_size)
@@ -87,17 +97,20 @@ class ResearchService(BaseService):
         except ValidationError as error:
             raise ValidationError(error.messages) from error
 
-    def search_researches_by_title(self, title: str) -> Dict[str, Any]:
+    def search_researches_by_title(
+        self, title: str, page: int = 1
+    ) -> Dict[str, Any]:
         """
         Search for research entries by title.
 
         Args:
             title: The search term to look for in the title field.
+            page: Page number, used when listing with an empty title.
 
         Returns:
             Dictionary containing search results and pagination metadata.
         """
-        return search_by_multilang_field(self.model_class, "title", title)
+        return self.substring_search(["title"], title, page)
 
     def validate_form_data(
         self, form_data: Dict[str, Any], files: Dict[str, Any]
@@ -49,7 +49,9 @@ class SubscriberService(BaseService):
 
     def __init__(self, page_size: int = 10):
         """Initialize subscriber service."""
-        super().__init__(Subscriber, SubscriberSchema, page_size)
+        super().__init__(
+            Subscriber, SubscriberSchema, page_size, count_strategy="cached"
+        )
         self.queue_service = QueueService()
         self.sender_email = Config.SMTP_USER
 
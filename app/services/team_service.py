@@ -4,13 +4,12 @@ Team Service Module
 This module provides the business logic for team-related operations.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from marshmallow import ValidationError
 
 from app.models import Team
 from app.schemas import TeamSchema
-from utils.db_utils import search_by_multilang_field
 from utils.form_utils import parse_nested_field
 from utils.service_base import BaseService
 
@@ -34,15 +33,9 @@ class TeamService(BaseService):
             # Validate with schema
             self.validate_with_schema(processed_data)
 
-            # validate the uniqueness of team member order
-            existing_team_member = self.model_class.get_by(
-                order=processed_data["order"]
-            )
-
-            if existing_team_member:
-                self.update_team_member_order(
-                    order=processed_data["order"], mode=1
-                )
+            # Open the slot of the new member
+            if self.model_class.get_by(order=processed_data["order"]):
+                self.model_class.shift_order(processed_data["order"], 1)
 
             team_member = self.model_class()
             team_member.create(**processed_data)
@@ -62,31 +55,28 @@ class TeamService(BaseService):
             # Validate with schema
             self.validate_with_schema(processed_data)
 
-            # validate the uniqueness of team member order
-            existing_team_member = self.model_class.get_by(
-                order=processed_data["order"]
-            )
-
-            if existing_team_member and existing_team_member.uuid != uuid:
-                self.update_team_member_order(
-                    order=processed_data["order"],
-                    mode=0,
-                    limit=self.model_class.get_byuuid(uuid).order,
-                )
-
             team_member = self.model_class.get_byuuid(uuid)
-            if team_member:
-                team_member.update(**processed_data)
-                return team_member
+            if not team_member:
+                return None
 
-            return None
+            # Move the members between the old and the new position
+            old, new = team_member.order, processed_data["order"]
+            if new < old:
+                self.model_class.shift_order(new, 1, end=old - 1)
+            elif new > old:
+                self.model_class.shift_order(old + 1, -1, end=new)
+
+            team_member.update(**processed_data)
+            return team_member
 
         except ValidationError as error:
             raise ValidationError(error.messages) from error
 
-    def search_team_members_by_name(self, name: str) -> Dict[str, Any]:
+    def search_team_members_by_name(
+        self, name: str, page: int = 1
+    ) -> Dict[str, Any]:
         """Search for team members by name."""
-        return search_by_multilang_field(self.model_class, "name", name)
+        return self.substring_search(["name"], name, page)
 
     def validate_form_data(
         self, form_data: Dict[str, Any], files: Dict[str, Any]
@@ -117,45 +107,32 @@ class TeamService(BaseService):
 
         return processed_data
 
-    def update_team_member_order(
-        self, order: int, mode: int, limit: Optional[int] = 0
-    ) -> Optional[Team]:
+    def delete_team_member(self, uuid: str) -> bool:
         """
-        Cascade update the order of a team member on create/update team member.
+        Delete a team member and close the gap it leaves in the order.
 
-        :param order: The order of the team member.
-        :param mode: The mode of the order (1 for increase, -1 for decrease).
-        :return: The updated team member or None if not found.
+        Returns:
+            True if the team member was deleted, False if not found
         """
-        team_member = self.model_class.get_by(order=order)
-        if team_member:
-            if order < 1 or order > self.get_max_order():
-                return None
-            if limit:
-                if order > limit:
-                    team_member.order -= 1
-                    team_member.update()
-                    return self.update_team_member_order(order - 1, mode, limit)
-                elif order < limit:
-                    team_member.order += 1
-                    team_member.update()
-                    return self.update_team_member_order(order + 1, mode, limit)
-            elif mode == 1:
-                self.update_team_member_order(order + 1, mode)
-                team_member.order += 1
-                team_member.update()
-            elif mode == -1:
-                self.update_team_member_order(order + 1, mode)
-                team_member.order -= 1
-                team_member.update()
-            return team_member
+        team_member = self.model_class.get_byuuid(uuid)
+        if not team_member:
+            return False
+        self.model_class.shift_order(team_member.order + 1, -1)
+        team_member.delete()
+        return True
+
+    def reorder_team_members(self, uuids: List[str]) -> int:
+        """
+        Write the order of team members given in their new sequence.
+
+        Args:
+            uuids: UUIDs of the team members, as dragged into place
 
-        return None
+        Returns:
+            The number of team members reordered, 0 if `uuids` is invalid
+        """
+        return self.model_class.reorder(uuids)
 
     def get_max_order(self) -> int:
         """Get the maximum order of team members."""
-        all_members = self.model_class.get_all()
-        max_order = max(
-            (member.order for member in all_members), default=None
-        )
-        return max_order if max_order else 0
+        return self.model_class.max_order()
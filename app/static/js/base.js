@@ -47,13 +47,41 @@ document.addEventListener('DOMContentLoaded', function () {
         document.dir = 'ltr'
     }
 
-    const csrfToken = document
-        .querySelector('meta[name="csrf-token"]')
-        ?.getAttribute('content')
+    const csrfMeta = document.querySelector('meta[name="csrf-token"]')
+    let csrfToken = csrfMeta?.getAttribute('content')
 
-    if (typeof htmx !== 'undefined' && csrfToken) {
+    // Pages served from the CDN cache carry no token, fetch one on demand
+    function loadCsrfToken() {
+        if (csrfToken || !csrfMeta) {
+            return Promise.resolve(csrfToken)
+        }
+        return fetch('/csrf-token', { credentials: 'same-origin' })
+            .then((response) => response.json())
+            .then((data) => {
+                csrfToken = data.csrf_token
+                csrfMeta.setAttribute('content', csrfToken)
+                return csrfToken
+            })
+    }
+
+    document.addEventListener('focusin', function (event) {
+        if (event.target.closest('form')) {
+            loadCsrfToken()
+        }
+    })
+
+    if (typeof htmx !== 'undefined') {
+        document.body.addEventListener('htmx:confirm', function (event) {
+            if (csrfToken || event.detail.verb === 'get') {
+                return
+            }
+            event.preventDefault()
+            loadCsrfToken().then(() => event.detail.issueRequest())
+        })
         document.body.addEventListener('htmx:configRequest', function (event) {
-            event.detail.headers['X-CSRFToken'] = csrfToken
+            if (csrfToken) {
+                event.detail.headers['X-CSRFToken'] = csrfToken
+            }
         })
     }
 })
@@ -68,6 +68,35 @@ if (!window.dashboardInitialized) {
         }
     })
 
+    // Drag and drop the items of a sortable list, the list form posts
+    // the new sequence once an item is dropped
+    let draggedItem = null
+    let nextSibling = null
+    tabsContainer.addEventListener('dragstart', (event) => {
+        draggedItem = event.target.closest('[data-sortable] > [draggable]')
+        nextSibling = draggedItem?.nextElementSibling
+        draggedItem?.classList.add('opacity-50')
+    })
+    tabsContainer.addEventListener('dragover', (event) => {
+        const item = event.target.closest('[data-sortable] > [draggable]')
+        if (!draggedItem || !item || item.parentNode !== draggedItem.parentNode)
+            return
+        event.preventDefault()
+        if (item === draggedItem) return
+        const { top, height } = item.getBoundingClientRect()
+        item.parentNode.insertBefore(
+            draggedItem,
+            event.clientY > top + height / 2 ? item.nextSibling : item
+        )
+    })
+    tabsContainer.addEventListener('dragend', () => {
+        if (!draggedItem) return
+        draggedItem.classList.remove('opacity-50')
+        if (draggedItem.nextElementSibling !== nextSibling)
+            htmx.trigger(draggedItem.parentNode, 'reorder')
+        draggedItem = null
+    })
+
     // Restore the active tab on page load
     restoreActiveTabFromLocalStorage()
 }
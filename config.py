@@ -23,6 +23,9 @@ class Config:
     BABEL_SUPPORTED_LOCALES = ["en", "ar"]
     BABEL_TRANSLATION_DIRECTORIES = str(BASE_DIR / "app/translations")
 
+    # PostgreSQL text search configuration of each locale
+    SEARCH_CONFIGS = {"en": "english", "ar": "arabic"}
+
     # Settings for storage backends
     STORAGE_TYPE = getenv("STORAGE_TYPE", "local")  # local or s3
     S3_BUCKET = "swea-bucket-name"
@@ -104,6 +107,43 @@ class Config:
     CACHE_REDIS_URL = getenv("CACHE_REDIS_URL")
     CACHE_KEY_PREFIX = "swea_"
     CACHE_DEFAULT_TIMEOUT = 86400  # 1 day
+    CACHE_STALE_TIMEOUT = 600  # 10 minutes of stale-while-revalidate
+    CACHE_SINGLE_FLIGHT = True  # a single worker fills a missing key
+    CACHE_FILL_LOCK_TIMEOUT = 30  # seconds a fill may hold its lock
+    CACHE_FILL_WAIT = 2  # seconds other workers wait for the fill
+
+    # Cache warm-up (`flask cache warm`, and optionally after invalidation)
+    CACHE_WARM_PAGES = 3  # pages of each paginated listing
+    CACHE_WARM_CONCURRENCY = 4  # views rendered at the same time
+    CACHE_WARM_ON_INVALIDATE = bool(int(getenv("CACHE_WARM_ON_INVALIDATE", 0)))
+
+    # In-process cache tier in front of Redis (one per gunicorn worker)
+    CACHE_LOCAL_MAX_BYTES = int(
+        getenv("CACHE_LOCAL_MAX_BYTES", 32 * 1024 * 1024)
+    )  # 32 MiB
+    CACHE_LOCAL_TIMEOUT = 300  # 5 minutes
+    CACHE_INVALIDATION_CHANNEL = f"{CACHE_KEY_PREFIX}invalidation"
+    COUNT_CACHE_TIMEOUT = 3600  # seconds a cached row count is trusted
+    ENTITY_CACHE_TIMEOUT = 3600  # seconds a row stays in the entity cache
+    ENTITY_CACHE_TOMBSTONE_TIMEOUT = 60  # seconds an eviction blocks fills
+
+    # Cache telemetry (`flask cache stats`, `/metrics`)
+    CACHE_STATS = bool(int(getenv("CACHE_STATS", 1)))
+    CACHE_STATS_FLUSH_INTERVAL = 10  # seconds between two flushes to Redis
+    METRICS_TOKEN = getenv("METRICS_TOKEN")  # bearer token of `/metrics`
+
+    # Purge of the soft-deleted rows into archive tables (`flask purge`)
+    PURGE_RETENTION_DAYS = int(getenv("PURGE_RETENTION_DAYS", 30))
+    PURGE_BATCH_SIZE = 500  # rows archived per transaction
+    PURGE_INTERVAL = 86400  # seconds between two purges of the queue worker
+
+    # Shared caching of public pages by a CDN / reverse proxy (0 disables)
+    CDN_S_MAXAGE = int(getenv("CDN_S_MAXAGE", 300))  # 5 minutes
+    CDN_STALE_WHILE_REVALIDATE = 600  # 10 minutes
+    CDN_PURGE_BACKEND = getenv("CDN_PURGE_BACKEND", "none")  # none or http
+    CDN_PURGE_URL = getenv("CDN_PURGE_URL", "http://127.0.0.1:8099/")
+    CDN_PURGE_METHOD = getenv("CDN_PURGE_METHOD", "PURGE")
+    CDN_PURGE_TOKEN = getenv("CDN_PURGE_TOKEN")
 
     @staticmethod
     def get_git_commit_hash():
@@ -1,21 +1,159 @@
 """Module to handle caching of responses dynamically."""
 
-from functools import wraps
-from typing import Callable, List
+import json
+import logging
+import os
+from functools import lru_cache, wraps
+from threading import Lock, Thread
+from time import monotonic, perf_counter, sleep, time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 import redis
-from flask import request
+from flask import (
+    copy_current_request_context,
+    has_request_context,
+    request,
+)
+from redis.exceptions import LockError
 
-from app.extensions import cache
+from app.extensions import cache, get_locale
 from config import Config
+from utils.cache_stats import (
+    record_fill,
+    record_hit,
+    record_invalidation,
+    record_miss,
+)
+from utils.compact_response import (
+    CompactResponse,
+    pack_response,
+    unpack_response,
+)
+from utils.http_cache import (
+    conditional_response,
+    request_etag,
+    value_digest,
+    value_last_modified,
+)
+from utils.local_cache import LocalCache
 
+# Maximum number of keys passed to a single UNLINK command
+UNLINK_BATCH_SIZE = 1000
 
-def generate_cache_key(func_name: str) -> str:
+# Seconds between two cache lookups while another worker fills a key
+FILL_POLL_INTERVAL = 0.05
+
+# Per-process tier consulted before Redis by `cache_response(local=True)`
+local_cache = LocalCache(
+    max_bytes=Config.CACHE_LOCAL_MAX_BYTES, timeout=Config.CACHE_LOCAL_TIMEOUT
+)
+_listener_pid = None
+_listener_lock = Lock()
+
+# Functions cached with stale-while-revalidate, and the TTL of their entries
+_stale_tags: Dict[str, int] = {}
+
+# Callables run with the function names passed to `invalidate_cache`
+invalidation_hooks: List[Callable[[List[str]], None]] = []
+
+
+@lru_cache(maxsize=1)
+def get_cache_redis() -> redis.Redis:
+    """Return the Redis client of the cache database (one pool per process)."""
+    return redis.Redis.from_url(Config.CACHE_REDIS_URL)
+
+
+def tag_key(tag: str, prefix: str = Config.CACHE_KEY_PREFIX) -> str:
+    """Redis key of the set holding every cache key recorded under `tag`."""
+    return f"{prefix}tags:{tag}"
+
+
+def invalidated_key(tag: str) -> str:
+    """Cache key holding the last time the entries of `tag` were invalidated."""
+    return f"invalidated:{tag}"
+
+
+def _on_invalidation(message) -> None:
+    """Drop the local entries of the function names in a pub/sub message."""
+    local_cache.invalidate(json.loads(message["data"]))
+
+
+def _on_listener_error(error, pubsub, thread) -> None:
+    """Keep the listener alive, invalidation messages may have been missed."""
+    logging.warning("Cache invalidation listener error: %s", error)
+    local_cache.clear()
+    sleep(1)
+
+
+def start_invalidation_listener() -> None:
+    """
+    Subscribe this process to the cache invalidation channel.
+
+    Started lazily on the first local lookup so each gunicorn worker runs its
+    own listener thread after the fork.
+    """
+    global _listener_pid
+
+    if _listener_pid == os.getpid():
+        return
+
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+        pubsub = get_cache_redis().pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(
+            **{Config.CACHE_INVALIDATION_CHANNEL: _on_invalidation}
+        )
+        pubsub.run_in_thread(
+            sleep_time=1, daemon=True, exception_handler=_on_listener_error
+        )
+        _listener_pid = os.getpid()
+
+
+def _normalize_query(query: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """
+    Query parameters of the request that change the response.
+
+    Only the parameters declared in `query` are kept, and those equal to
+    their declared default (after casting to the default's type) are dropped,
+    so `?page=1`, `?page=01` and no page at all share one entry.
+    """
+    params = []
+    for name, default in sorted(query.items()):
+        value = request.args.get(name)
+        if value is None:
+            continue
+        if default is not None:
+            try:
+                value = type(default)(value)
+            except ValueError:
+                pass
+        if value != default:
+            params.append((name, value))
+    return params
+
+
+def generate_cache_key(
+    func_name: str,
+    vary: Optional[List[str]] = None,
+    query: Optional[Dict[str, Any]] = None,
+) -> str:
     """Generate a cache key using:
     - Function name
     - HTTP method (GET, POST, etc.)
     - Path parameters (e.g., UUID in `/projects/<uuid>`)
-    - Query parameters (e.g., `?sort=asc`)
+    - Query parameters (e.g., `?sort=asc`), all of them unless `query`
+      declares the known ones with their default values
+    - Varying request values: header names (e.g., `hx-tab`) or `locale`
     """
     key_parts = [
         func_name,
@@ -28,52 +166,331 @@ def generate_cache_key(func_name: str) -> str:
             key_parts.append(f"path_{k}-{v}")
 
     # Include query parameters
-    for k, v in sorted(request.args.items()):
+    params = (
+        sorted(request.args.items())
+        if query is None
+        else _normalize_query(query)
+    )
+    for k, v in params:
         key_parts.append(f"query_{k}-{v}")
 
+    # Include the request values the response varies on
+    for name in vary or ():
+        value = (
+            get_locale() if name == "locale" else request.headers.get(name, "")
+        )
+        key_parts.append(f"vary_{name.lower()}-{value}")
+
     return "_".join(key_parts)
 
 
-def cache_response(timeout: int = Config.CACHE_DEFAULT_TIMEOUT) -> Callable:
-    """Decorator to cache responses dynamically with consistent key generation."""
+def tag_cache_key(tag: str, cache_key: str, timeout: int) -> None:
+    """
+    Record `cache_key` in the tag set of `tag`.
+
+    The tag set lives as long as the newest key recorded in it, members
+    that expired earlier are harmless since unlinking a missing key is a no-op.
+    """
+    if Config.CACHE_TYPE != "redis":
+        return
+
+    key = tag_key(tag)
+    with get_cache_redis().pipeline(transaction=False) as pipe:
+        pipe.sadd(key, f"{Config.CACHE_KEY_PREFIX}{cache_key}")
+        if timeout:
+            pipe.expire(key, timeout)
+        pipe.execute()
+
+
+def unlink_tagged(redis_conn: redis.Redis, tag_keys: Iterable[str]) -> int:
+    """
+    Unlink every key recorded in the given tag sets, and the sets themselves.
+
+    Members are read and the tag sets dropped in a single MULTI block, so a key
+    tagged concurrently lands in a fresh set instead of being lost.
+
+    Returns:
+        The number of tagged keys that were unlinked
+    """
+    tag_keys = list(tag_keys)
+    with redis_conn.pipeline(transaction=True) as pipe:
+        for key in tag_keys:
+            pipe.smembers(key)
+        pipe.unlink(*tag_keys)
+        *members, _ = pipe.execute()
+
+    keys = list(set().union(*members))
+    with redis_conn.pipeline(transaction=False) as pipe:
+        for i in range(0, len(keys), UNLINK_BATCH_SIZE):
+            pipe.unlink(*keys[i : i + UNLINK_BATCH_SIZE])
+        pipe.execute()
+    return len(keys)
+
+
+class CacheEntry(NamedTuple):
+    """
+    A cached view result, the time it was computed at and its validators.
+
+    Rendered responses are kept as a `CompactResponse`, other values (the
+    dict model of full pages, which embed a per-session CSRF token and can
+    only be rendered per request) are kept as returned by the view. `size`
+    is the size of the compressed bodies of a `CompactResponse`, None for
+    the other values.
+    """
+
+    value: Any
+    stored_at: float
+    digest: str = ""
+    last_modified: Optional[float] = None
+    size: Optional[int] = None
+
+
+def fill_lock(cache_key: str) -> redis.lock.Lock:
+    """Lock guarding the fill of `cache_key` across all workers."""
+    return get_cache_redis().lock(
+        f"{Config.CACHE_KEY_PREFIX}lock:{cache_key}",
+        timeout=Config.CACHE_FILL_LOCK_TIMEOUT,
+        thread_local=False,
+    )
+
+
+def _release(lock: redis.lock.Lock) -> None:
+    """Release a fill lock, which may have expired during a slow fill."""
+    try:
+        lock.release()
+    except LockError:
+        pass
+
+
+def _fill(func, args, kwargs, cache_key, tag, ttl, local) -> CacheEntry:
+    """Compute a view result and store it in every cache tier."""
+    start = perf_counter()
+    value = pack_response(func(*args, **kwargs))
+    stored_at = time()
+    entry = CacheEntry(
+        value,
+        stored_at,
+        value_digest(value),
+        value_last_modified(value) or stored_at,
+        value.size if isinstance(value, CompactResponse) else None,
+    )
+    record_fill(tag, perf_counter() - start, entry.size)
+    cache.set(cache_key, entry, timeout=ttl)
+    tag_cache_key(tag, cache_key, ttl)
+    if local:
+        local_cache.set(cache_key, tag, entry)
+    return entry
+
+
+def _serve(entry: CacheEntry) -> Any:
+    """Answer the current request from a cache entry, with conditional GET."""
+    personal = not isinstance(entry.value, CompactResponse)
+    not_modified = conditional_response(
+        request_etag(entry.digest, personal), entry.last_modified, personal
+    )
+    return not_modified or unpack_response(entry.value)
+
+
+def _stale_since(entry: CacheEntry, timeout: int, invalidated_at) -> float:
+    """Time an entry became stale, through expiry or invalidation."""
+    expires_at = entry.stored_at + timeout if timeout else float("inf")
+    if invalidated_at and invalidated_at > entry.stored_at:
+        return min(expires_at, invalidated_at)
+    return expires_at
+
+
+def _refresh_in_background(func, args, kwargs, cache_key, tag, ttl, local):
+    """Rebuild a stale entry in a thread, once across all workers."""
+    lock = fill_lock(cache_key)
+    if not lock.acquire(blocking=False):
+        return
+
+    @copy_current_request_context
+    def refresh():
+        try:
+            _fill(func, args, kwargs, cache_key, tag, ttl, local)
+        except Exception as e:
+            logging.error("Failed to refresh cache key '%s': %s", cache_key, e)
+        finally:
+            _release(lock)
+
+    Thread(target=refresh, daemon=True).start()
+
+
+def _fill_once(func, args, kwargs, cache_key, tag, ttl, local, stale):
+    """
+    Fill a missing entry, letting a single worker run the view at a time.
+
+    Workers losing the race poll the cache for the entry being computed,
+    and fall back to the stale entry (or to computing it themselves) when
+    it does not show up within `CACHE_FILL_WAIT` seconds.
+    """
+    if Config.CACHE_TYPE != "redis" or not Config.CACHE_SINGLE_FLIGHT:
+        return _fill(func, args, kwargs, cache_key, tag, ttl, local)
+
+    lock = fill_lock(cache_key)
+    if lock.acquire(blocking=False):
+        try:
+            return _fill(func, args, kwargs, cache_key, tag, ttl, local)
+        finally:
+            _release(lock)
+
+    started_at = time()
+    deadline = monotonic() + Config.CACHE_FILL_WAIT
+    while monotonic() < deadline:
+        sleep(FILL_POLL_INTERVAL)
+        entry = cache.get(cache_key)
+        if isinstance(entry, CacheEntry) and entry.stored_at >= started_at:
+            record_hit(tag, "coalesced")
+            return entry
+        if stale and not lock.locked():
+            break
+
+    if stale:
+        record_hit(tag, "stale")
+        return stale
+    return _fill(func, args, kwargs, cache_key, tag, ttl, local)
+
+
+def cache_response(
+    timeout: int = Config.CACHE_DEFAULT_TIMEOUT,
+    local: bool = False,
+    stale_while_revalidate: int = 0,
+    vary: Optional[List[str]] = None,
+    query: Optional[Dict[str, Any]] = None,
+) -> Callable:
+    """Decorator to cache responses dynamically with consistent key generation.
+
+    Every key written is recorded in the tag set of the decorated function,
+    which lets `invalidate_cache` drop them without scanning the keyspace.
+
+    Args:
+        timeout: Seconds the response stays fresh in the Redis cache
+        local: Also keep the response in the in-process tier, serving hot
+               pages without a round trip to Redis
+        stale_while_revalidate: Seconds an expired or invalidated response
+               keeps being served while a single background refresh
+               rebuilds it
+        vary: Request headers (or `locale`) the response depends on
+        query: Query parameters the response depends on, mapped to their
+               default value; any other parameter is left out of the key
+
+    Example:
+        ```
+        @cache_response(vary=["hx-tab", "locale"], query={"page": 1})
+        def knowledge_hub():
+            ...
+        ```
+    """
+    local = local and Config.CACHE_TYPE == "redis"
+    grace = stale_while_revalidate if Config.CACHE_TYPE == "redis" else 0
 
     def decorator(func: Callable):
+        tag = func.__name__
+        ttl = timeout + grace if timeout else 0
+        if grace:
+            _stale_tags[tag] = ttl
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            cache_key = generate_cache_key(func.__name__)
-            cached_data = cache.get(cache_key)
+            cache_key = generate_cache_key(tag, vary, query)
+            now = time()
+
+            if local:
+                start_invalidation_listener()
+                entry = local_cache.get(cache_key)
+                if entry and (not timeout or entry.stored_at + timeout > now):
+                    record_hit(tag, "local")
+                    return _serve(entry)
+
+            if grace:
+                entry, invalidated_at = cache.get_many(
+                    cache_key, invalidated_key(tag)
+                )
+            else:
+                entry, invalidated_at = cache.get(cache_key), None
+
+            if not isinstance(entry, CacheEntry):
+                entry = None
+
+            stale = None
+            if entry and grace:
+                stale_since = _stale_since(entry, timeout, invalidated_at)
+                if stale_since <= now:
+                    if now - stale_since <= grace:
+                        _refresh_in_background(
+                            func, args, kwargs, cache_key, tag, ttl, local
+                        )
+                        record_hit(tag, "stale")
+                        return _serve(entry)
+                    entry, stale = None, entry
 
-            if cached_data:
-                return cached_data
+            if entry:
+                if local:
+                    local_cache.set(cache_key, tag, entry)
+                record_hit(tag, "redis")
+                return _serve(entry)
 
-            response = func(*args, **kwargs)
-            cache.set(cache_key, response, timeout=timeout)
-            return response
+            record_miss(tag)
+            entry = _fill_once(
+                func, args, kwargs, cache_key, tag, ttl, local, stale
+            )
+            return _serve(entry)
 
+        wrapper.cache_tag = tag
         return wrapper
 
     return decorator
 
 
-def invalidate_cache(func_names: List[str]) -> None:
+def invalidate_cache(
+    func_names: List[str], reason: Optional[str] = None
+) -> None:
     """
     Invalidate cache entries for a given list of function names.
 
-    - Uses wildcard matching to find and remove cache keys.
+    - Reads the keys to remove from the tag sets filled by `cache_response`,
+      so the cost is O(tagged keys) instead of a SCAN over the whole keyspace.
     - Uses Redis `unlink()` instead of `delete()` for non-blocking deletion.
-    - Uses `pipeline()` for batch deletion, reducing network round trips.
+    - Keeps the entries of stale-while-revalidate functions, only marking
+      them stale so they are refreshed in the background on the next hit.
+    - Publishes the function names so every process drops its local entries.
+    - Runs the registered `invalidation_hooks` (e.g. cache warm-up).
+
+    Args:
+        func_names: Names of the cached functions to invalidate
+        reason: Recorded in the cache telemetry, defaults to the HTTP method
+                of the current request (`post`, `put`, `delete`...)
     """
 
-    if Config.CACHE_TYPE != "redis":
+    if Config.CACHE_TYPE != "redis" or not func_names:
         return
 
-    redis_conn = redis.Redis.from_url(Config.CACHE_REDIS_URL)
-    patterns = [
-        f"{Config.CACHE_KEY_PREFIX}{func_name}*" for func_name in func_names
+    redis_conn = get_cache_redis()
+    stale = [name for name in func_names if name in _stale_tags]
+    if stale:
+        now = time()
+        cache.set_many(
+            {invalidated_key(name): now for name in stale},
+            timeout=max(_stale_tags[name] for name in stale),
+        )
+
+    tag_keys = [
+        tag_key(name) for name in func_names if name not in _stale_tags
     ]
+    if tag_keys:
+        unlink_tagged(redis_conn, tag_keys)
 
-    with redis_conn.pipeline() as pipe:  # Batch operations
-        for pattern in patterns:
-            for key in redis_conn.scan_iter(pattern, count=1000):
-                pipe.unlink(key)
-        pipe.execute()
+    local_cache.invalidate(func_names)
+    if reason is None:
+        reason = request.method.lower() if has_request_context() else "manual"
+    record_invalidation(func_names, reason)
+    redis_conn.publish(
+        Config.CACHE_INVALIDATION_CHANNEL, json.dumps(func_names)
+    )
+
+    for hook in invalidation_hooks:
+        try:
+            hook(func_names)
+        except Exception as e:
+            logging.error("Cache invalidation hook %s failed: %s", hook, e)
@@ -0,0 +1,271 @@
+"""Per-endpoint telemetry of the response cache."""
+
+import logging
+from bisect import bisect_left
+from collections import Counter
+from threading import Lock
+from time import monotonic
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+
+# Upper bounds (seconds) of the fill time histogram buckets
+FILL_TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Upper bounds (bytes) of the entry size histogram buckets
+ENTRY_SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Fields summed as floats, every other field is an integer counter
+FLOAT_FIELDS = {"fill_seconds_sum"}
+
+# Counters of this process not yet flushed to Redis, by (function, field)
+_pending: Counter = Counter()
+_pending_lock = Lock()
+_flushed_at = monotonic()
+
+
+def stats_key(tag: str) -> str:
+    """Redis hash holding the counters of the function cached under `tag`."""
+    return f"{Config.CACHE_KEY_PREFIX}stats:{tag}"
+
+
+def stats_index_key() -> str:
+    """Redis set of the functions that have counters."""
+    return f"{Config.CACHE_KEY_PREFIX}stats"
+
+
+def _enabled() -> bool:
+    """Telemetry needs the shared Redis cache to aggregate the workers."""
+    return Config.CACHE_STATS and Config.CACHE_TYPE == "redis"
+
+
+def _bucket(bounds: Tuple[float, ...], value: float) -> str:
+    """Name of the histogram bucket `value` falls in."""
+    i = bisect_left(bounds, value)
+    return str(bounds[i]) if i < len(bounds) else "+Inf"
+
+
+def _record(tag: str, counts: Dict[str, float]) -> None:
+    """Add `counts` to the pending counters of `tag`, flushing if due."""
+    if not _enabled():
+        return
+    with _pending_lock:
+        for field, amount in counts.items():
+            _pending[(tag, field)] += amount
+    flush()
+
+
+def record_hit(tag: str, tier: str) -> None:
+    """
+    Count a request served from the cache.
+
+    Args:
+        tag: Name of the cached function
+        tier: `local`, `redis`, `stale` (served while refreshing) or
+              `coalesced` (filled by another worker while waiting)
+    """
+    _record(tag, {f"hits_{tier}": 1})
+
+
+def record_miss(tag: str) -> None:
+    """Count a request that had to wait for the view to run."""
+    _record(tag, {"misses": 1})
+
+
+def record_fill(tag: str, seconds: float, size: Optional[int]) -> None:
+    """
+    Count a fill of the cache, with its duration and size.
+
+    Args:
+        tag: Name of the cached function
+        seconds: Time the view took to compute the entry
+        size: Bytes of the compressed bodies of the entry (see
+              `CacheEntry`), None if it holds no rendered response
+    """
+    counts = {
+        "fills": 1,
+        "fill_seconds_sum": seconds,
+        f"fill_seconds_bucket:{_bucket(FILL_TIME_BUCKETS, seconds)}": 1,
+    }
+    if size is not None:
+        counts["size_bytes_sum"] = size
+        counts[f"size_bytes_bucket:{_bucket(ENTRY_SIZE_BUCKETS, size)}"] = 1
+    _record(tag, counts)
+
+
+def record_invalidation(tags: Iterable[str], reason: str) -> None:
+    """Count an invalidation of every function in `tags`."""
+    for tag in tags:
+        _record(tag, {f"invalidations:{reason}": 1})
+
+
+def flush(force: bool = False) -> None:
+    """
+    Add the pending counters of this process to the shared Redis hashes.
+
+    Counters are kept in memory and flushed at most every
+    `CACHE_STATS_FLUSH_INTERVAL` seconds, so recording a hit does not cost
+    a round trip to Redis.
+    """
+    global _flushed_at
+
+    due = monotonic() - _flushed_at >= Config.CACHE_STATS_FLUSH_INTERVAL
+    if not (force or due):
+        return
+
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _flushed_at = monotonic()
+    if not pending:
+        return
+
+    from utils.cache_mgr import get_cache_redis
+
+    try:
+        with get_cache_redis().pipeline(transaction=False) as pipe:
+            for (tag, field), amount in pending.items():
+                if field in FLOAT_FIELDS:
+                    pipe.hincrbyfloat(stats_key(tag), field, amount)
+                else:
+                    pipe.hincrby(stats_key(tag), field, int(amount))
+            pipe.sadd(stats_index_key(), *{tag for tag, _ in pending})
+            pipe.execute()
+    except Exception as e:
+        logging.warning("Failed to flush cache stats: %s", e)
+
+
+def read_stats() -> Dict[str, Dict[str, float]]:
+    """Counters of every cached function, aggregated over all workers."""
+    from utils.cache_mgr import get_cache_redis
+
+    if not _enabled():
+        return {}
+    flush(force=True)
+    redis_conn = get_cache_redis()
+    tags = sorted(
+        tag.decode() for tag in redis_conn.smembers(stats_index_key())
+    )
+    with redis_conn.pipeline(transaction=False) as pipe:
+        for tag in tags:
+            pipe.hgetall(stats_key(tag))
+        hashes = pipe.execute()
+
+    return {
+        tag: {field.decode(): float(value) for field, value in fields.items()}
+        for tag, fields in zip(tags, hashes)
+    }
+
+
+def reset_stats() -> None:
+    """Drop the counters of every cached function."""
+    from utils.cache_mgr import get_cache_redis
+
+    with _pending_lock:
+        _pending.clear()
+    redis_conn = get_cache_redis()
+    tags = [tag.decode() for tag in redis_conn.smembers(stats_index_key())]
+    redis_conn.unlink(stats_index_key(), *(stats_key(tag) for tag in tags))
+
+
+def hit_ratio(counters: Dict[str, float]) -> float:
+    """Share of the requests of a function answered from the cache."""
+    hits = sum(v for k, v in counters.items() if k.startswith("hits_"))
+    total = hits + counters.get("misses", 0)
+    return hits / total if total else 0.0
+
+
+def _histogram(
+    lines: List[str],
+    name: str,
+    tag: str,
+    counters: Dict[str, float],
+    bounds: Tuple[float, ...],
+) -> None:
+    """Append a Prometheus histogram built from per-bucket counters."""
+    cumulative = 0.0
+    for bound in [*map(str, bounds), "+Inf"]:
+        cumulative += counters.get(f"{name}_bucket:{bound}", 0)
+        lines.append(
+            f'swea_cache_{name}_bucket{{view="{tag}",le="{bound}"}} '
+            f"{cumulative:g}"
+        )
+    lines.append(
+        f'swea_cache_{name}_sum{{view="{tag}"}} '
+        f'{counters.get(f"{name}_sum", 0):g}'
+    )
+    lines.append(f'swea_cache_{name}_count{{view="{tag}"}} {cumulative:g}')
+
+
+def render_prometheus(stats: Dict[str, Dict[str, float]]) -> str:
+    """Render the counters of `read_stats` in the Prometheus text format."""
+    lines = [
+        "# TYPE swea_cache_hits_total counter",
+        "# TYPE swea_cache_misses_total counter",
+        "# TYPE swea_cache_invalidations_total counter",
+        "# TYPE swea_cache_fill_seconds histogram",
+        "# TYPE swea_cache_size_bytes histogram",
+    ]
+    for tag, counters in stats.items():
+        for field, value in sorted(counters.items()):
+            if field.startswith("hits_"):
+                lines.append(
+                    f'swea_cache_hits_total{{view="{tag}",'
+                    f'tier="{field[5:]}"}} {value:g}'
+                )
+            elif field.startswith("invalidations:"):
+                lines.append(
+                    f'swea_cache_invalidations_total{{view="{tag}",'
+                    f'reason="{field[14:]}"}} {value:g}'
+                )
+        lines.append(
+            f'swea_cache_misses_total{{view="{tag}"}} '
+            f'{counters.get("misses", 0):g}'
+        )
+        _histogram(lines, "fill_seconds", tag, counters, FILL_TIME_BUCKETS)
+        _histogram(lines, "size_bytes", tag, counters, ENTRY_SIZE_BUCKETS)
+    return "\n".join(lines) + "\n"
+
+
+def sample_memory(
+    tags: Iterable[str], sample: int = 1000
+) -> Dict[str, Tuple[int, int]]:
+    """
+    Redis memory used per key prefix, measured on a sample of the keyspace.
+
+    Cache entries are grouped by the function they were cached under, the
+    bookkeeping keys (`tags:`, `lock:`, `stats:`...) by their own prefix.
+
+    Returns:
+        Sampled key count and `MEMORY USAGE` bytes, by prefix
+    """
+    from utils.cache_mgr import get_cache_redis
+
+    if Config.CACHE_TYPE != "redis":
+        return {}
+    redis_conn = get_cache_redis()
+    prefix = Config.CACHE_KEY_PREFIX
+    # Longest names first, so `get_single_news_` wins over `get_news_`...
+    names = sorted(tags, key=len, reverse=True)
+
+    keys = []
+    for key in redis_conn.scan_iter(f"{prefix}*", count=1000):
+        keys.append(key.decode())
+        if len(keys) >= sample:
+            break
+
+    with redis_conn.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.memory_usage(key)
+        sizes = pipe.execute()
+
+    usage: Dict[str, Tuple[int, int]] = {}
+    for key, size in zip(keys, sizes):
+        name = key[len(prefix) :]
+        group = next(
+            (tag for tag in names if name.startswith(f"{tag}_")),
+            name.split(":", 1)[0] + ":" if ":" in name else "other",
+        )
+        count, total = usage.get(group, (0, 0))
+        usage[group] = (count + 1, total + (size or 0))
+    return usage
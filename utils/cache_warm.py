@@ -0,0 +1,160 @@
+"""Pre-render public pages so the response cache is hot before real traffic."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread, local
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from flask import Flask, current_app, request
+from flask.testing import FlaskClient
+from werkzeug.exceptions import HTTPException
+
+from app.models import News, Project, Research
+from app.services import ProjectService
+from config import Config
+from utils.rate_limiter import limiter
+
+# (path, request headers) of a page to pre-render
+WarmTarget = Tuple[str, Dict[str, str]]
+
+# WSGI environ key marking the warm-up requests (clients cannot set it)
+WARM_ENVIRON = "swea.cache_warm"
+
+# Test client of each warm-up thread, keeping its session cookie
+_clients = local()
+
+# Entity detail pages, as (model, path prefix)
+DETAIL_PAGES = [
+    (Project, "/projects/"),
+    (Research, "/knowledge-hub/researches/"),
+    (News, "/news/"),
+]
+
+
+def warm_targets(pages: int) -> List[WarmTarget]:
+    """
+    Every public page worth pre-rendering, in every supported locale.
+
+    Covers the sitemap routes, the first `pages` pages of the paginated
+    HTMX listings and the detail page of every entity.
+    """
+    from api.v1.views import PUBLIC_ROUTES
+    from api.v1.views.main import PROJECTS_SORT, TAB_CONTENT_MAP
+
+    targets: List[WarmTarget] = [(route, {}) for route, _, _ in PUBLIC_ROUTES]
+
+    # The projects listing loads more pages by cursor, follow them
+    service, cursor = ProjectService(), ""
+    for _ in range(1, pages):
+        listing = service.get_all(cursor=cursor, sort=PROJECTS_SORT)
+        cursor = listing["next_cursor"]
+        if not cursor:
+            break
+        targets.append((f"/projects?cursor={cursor}", {"hx-projects": "true"}))
+
+    for tab in TAB_CONTENT_MAP["knowledge_hub"]:
+        for page in range(1, pages + 1):
+            targets.append(
+                (f"/knowledge-hub?q={tab}&page={page}", {"hx-tab": "true"})
+            )
+
+    for model, prefix in DETAIL_PAGES:
+        uuids = model.query.with_entities(model.uuid).filter_by(
+            deleted_at=None
+        )
+        targets.extend((f"{prefix}{uuid}", {}) for (uuid,) in uuids)
+
+    return [
+        (f"{path}{'&' if '?' in path else '?'}lang={locale}", headers)
+        for path, headers in targets
+        for locale in Config.BABEL_SUPPORTED_LOCALES
+    ]
+
+
+@limiter.request_filter
+def _is_warm_request() -> bool:
+    """Exempt the warm-up requests from the rate limits."""
+    return bool(request.environ.get(WARM_ENVIRON))
+
+
+def _client(app: Flask) -> FlaskClient:
+    """Test client of the current thread, one session per thread."""
+    if getattr(_clients, "app", None) is not app:
+        _clients.app, _clients.client = app, app.test_client()
+    return _clients.client
+
+
+def warm_path(
+    app: Flask, path: str, headers: Dict[str, str], tags: Optional[Set[str]]
+) -> bool:
+    """
+    Request `path` through the test client so its cache entry gets filled.
+
+    The request goes through the whole stack, `before_request` and
+    `after_request` handlers included, so the page is rendered (locale,
+    shared cache flag) exactly as for a visitor.
+
+    Returns:
+        True if the view is cached (and matches `tags`) and was rendered
+    """
+    try:
+        endpoint, _ = app.url_map.bind("localhost").match(urlsplit(path).path)
+    except HTTPException:
+        return False
+    tag = getattr(app.view_functions[endpoint], "cache_tag", None)
+    if not tag or (tags is not None and tag not in tags):
+        return False
+    try:
+        response = _client(app).get(
+            path, headers=headers, environ_base={WARM_ENVIRON: True}
+        )
+    except Exception as e:
+        logging.warning("Failed to warm cache of '%s': %s", path, e)
+        return False
+    if response.status_code != 200:
+        logging.warning(
+            "Failed to warm cache of '%s': HTTP %d", path, response.status_code
+        )
+        return False
+    return True
+
+
+def warm_cache(
+    app: Flask,
+    pages: int = Config.CACHE_WARM_PAGES,
+    concurrency: int = Config.CACHE_WARM_CONCURRENCY,
+    tags: Optional[Iterable[str]] = None,
+) -> Tuple[int, int]:
+    """
+    Pre-render the public pages with at most `concurrency` views at a time.
+
+    Args:
+        app: The Flask application
+        pages: Number of pages of each paginated listing to render
+        concurrency: Maximum number of views rendered concurrently
+        tags: Only render the views cached under these function names
+
+    Returns:
+        The number of pages rendered and the number of candidate pages
+    """
+    tags = set(tags) if tags is not None else None
+    with app.app_context():
+        targets = warm_targets(pages)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        warmed = pool.map(
+            lambda target: warm_path(app, *target, tags=tags), targets
+        )
+        return sum(warmed), len(targets)
+
+
+def warm_after_invalidation(func_names: List[str]) -> None:
+    """Invalidation hook re-rendering the invalidated views in the background."""
+    app = current_app._get_current_object()
+    Thread(
+        target=warm_cache,
+        args=(app,),
+        kwargs={"tags": func_names},
+        daemon=True,
+    ).start()
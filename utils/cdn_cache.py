@@ -0,0 +1,314 @@
+"""Shared (CDN / reverse proxy) caching of public pages and surrogate-key purge."""
+
+import abc
+import json
+import logging
+import urllib.request
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Callable, Iterable, List, Optional
+
+from flask import Response, current_app, g, request, session
+from sqlalchemy import event
+
+from app.extensions import db
+from config import Config
+
+# Surrogate key of the views cached under a `cache_response` function name
+VIEW_KEY = "view:{}"
+
+# Key of the session info holding the records to purge once committed
+PENDING_PURGES = "cdn_purges"
+
+
+def shared_cacheable() -> bool:
+    """
+    Whether the response to the current request may be stored by a CDN.
+
+    Only anonymous GET requests without a session cookie qualify: their
+    response depends on the URL (and the declared `Vary` headers) alone.
+    The proxy in front of the app must bypass its cache for requests that
+    carry the session cookie, those are answered per session as before.
+    """
+    return (
+        Config.CDN_S_MAXAGE > 0
+        and request.method in ("GET", "HEAD")
+        and Config.SESSION_COOKIE_NAME not in request.cookies
+    )
+
+
+def cdn_cache(*keys: str, vary: Optional[List[str]] = None) -> Callable:
+    """Decorator letting a CDN cache the response of a public view.
+
+    Responses to anonymous requests are rendered without touching the
+    session (no CSRF token is embedded, `base.js` fetches one from
+    `/csrf-token` when a form is used) and get shared caching headers:
+    `Cache-Control: public, s-maxage, stale-while-revalidate` and a
+    `Surrogate-Key` header to purge them by.
+
+    Args:
+        keys: Surrogate keys of the entities the page shows, formatted with
+              the view arguments (e.g. `project:{uuid}`). The writes of a
+              model purge the keys it declares in `surrogate_keys`. The
+              cache tag of the view is always added, so `invalidate_cache`
+              purges it.
+        vary: Request headers the response depends on (e.g. `hx-tab`)
+
+    Example:
+        ```
+        @bp.route("/projects/<uuid>")
+        @cdn_cache("projects", "project:{uuid}")
+        @response(template_file="project-page.html")
+        @cache_response(query={})
+        def project_page(uuid):
+            ...
+        ```
+    """
+
+    def decorator(func: Callable):
+        tag = getattr(func, "cache_tag", func.__name__)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if shared_cacheable():
+                g.shared_cache = True
+                g.surrogate_keys = [VIEW_KEY.format(tag)] + [
+                    key.format(**kwargs) for key in keys
+                ]
+                g.shared_vary = vary or []
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def set_shared_cache_headers(response: Response) -> Response:
+    """
+    `after_request` handler adding the shared caching headers.
+
+    Runs after the conditional GET handlers, and overrides their
+    `no-cache, private` for responses rendered in shared mode. Responses
+    that still wrote to the session, or that are not a success, keep
+    their headers.
+    """
+    if not g.get("shared_cache"):
+        return response
+    if session.modified or response.status_code not in (200, 304):
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
+
+    cache_control = response.cache_control
+    cache_control.no_cache = None
+    cache_control.private = None
+    cache_control.public = True
+    cache_control.max_age = 0
+    cache_control.s_maxage = Config.CDN_S_MAXAGE
+    cache_control.stale_while_revalidate = Config.CDN_STALE_WHILE_REVALIDATE
+    response.headers["Surrogate-Key"] = " ".join(g.surrogate_keys)
+    for header in g.shared_vary:
+        response.vary.add(header)
+    return response
+
+
+class PurgeBackend(abc.ABC):
+    """Abstract base class for all CDN purge backends."""
+
+    @abc.abstractmethod
+    def purge(self, keys: List[str]) -> bool:
+        """
+        Purge every cached response tagged with one of the surrogate keys.
+
+        Args:
+            keys: The surrogate keys to purge
+
+        Returns:
+            True if the purge was accepted, False otherwise
+        """
+        pass
+
+
+class NullPurgeBackend(PurgeBackend):
+    """Purge backend used when no CDN sits in front of the app."""
+
+    def purge(self, keys: List[str]) -> bool:
+        return True
+
+
+class HTTPPurgeBackend(PurgeBackend):
+    """
+    Purge backend sending the keys in a `Surrogate-Key` header.
+
+    Matches Varnish (xkey) and Fastly style purge APIs, as well as the
+    local stand-in started by `flask cache purge-server`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        method: str = "PURGE",
+        token: Optional[str] = None,
+        timeout: float = 2,
+    ):
+        self.url = url
+        self.method = method
+        self.token = token
+        self.timeout = timeout
+
+    def purge(self, keys: List[str]) -> bool:
+        purge_request = urllib.request.Request(
+            self.url,
+            method=self.method,
+            headers={"Surrogate-Key": " ".join(keys)},
+        )
+        if self.token:
+            purge_request.add_header("Fastly-Key", self.token)
+            purge_request.add_header("Authorization", f"Bearer {self.token}")
+        try:
+            with urllib.request.urlopen(
+                purge_request, timeout=self.timeout
+            ) as resp:  # nosec
+                return 200 <= resp.status < 300
+        except OSError as e:
+            logging.error("Failed to purge surrogate keys %s: %s", keys, e)
+            return False
+
+
+def create_purge_backend(
+    backend_type: str = Config.CDN_PURGE_BACKEND,
+) -> PurgeBackend:
+    """
+    Create the purge backend of the CDN in front of the app.
+
+    Args:
+        backend_type: The type of purge backend ('none' or 'http')
+
+    Raises:
+        ValueError: If the specified backend type is invalid
+    """
+    if backend_type == "none":
+        return NullPurgeBackend()
+    if backend_type == "http":
+        return HTTPPurgeBackend(
+            url=Config.CDN_PURGE_URL,
+            method=Config.CDN_PURGE_METHOD,
+            token=Config.CDN_PURGE_TOKEN,
+        )
+    raise ValueError(f"Invalid purge backend type: {backend_type}")
+
+
+def _purge_in_background(keys: List[str]) -> None:
+    """Send a purge to the CDN without holding up the request."""
+    backend = current_app.extensions["cdn_purge"]
+    Thread(target=backend.purge, args=(keys,), daemon=True).start()
+
+
+def purge_after_invalidation(func_names: List[str]) -> None:
+    """Invalidation hook purging the CDN copies of the invalidated views."""
+    _purge_in_background([VIEW_KEY.format(name) for name in func_names])
+
+
+def _purging(model) -> bool:
+    """Whether writes to `model` purge CDN copies."""
+    return Config.CDN_PURGE_BACKEND != "none" and bool(model.surrogate_keys)
+
+
+def record_keys(model, uuids: Iterable[str]) -> List[str]:
+    """Surrogate keys of the pages showing records of a model."""
+    return sorted(
+        {
+            key.format(uuid=uuid)
+            for key in model.surrogate_keys
+            for uuid in uuids
+        }
+    )
+
+
+def purge_records(model, uuids: Iterable[str]) -> None:
+    """
+    Purge the CDN copies of the pages showing committed records of a model.
+
+    Those are the `surrogate_keys` of the model: the pages of the records
+    themselves (e.g. `project:{uuid}`) and the listings they appear in.
+    """
+    if _purging(model):
+        _purge_in_background(record_keys(model, uuids))
+
+
+def purge_on_commit(model, uuids: Iterable[str]) -> None:
+    """
+    Purge the CDN copies of records once the current transaction commits.
+
+    For statements left for the caller to commit, like `evict_on_commit`.
+    """
+    if _purging(model):
+        db.session.info.setdefault(PENDING_PURGES, []).append(
+            (model, list(uuids))
+        )
+
+
+@event.listens_for(db.session, "after_commit")
+def _purge_committed(session) -> None:
+    """Purge the pages showing the records changed by the transaction."""
+    pending = session.info.pop(PENDING_PURGES, [])
+    keys = sorted(
+        {key for model, uuids in pending for key in record_keys(model, uuids)}
+    )
+    if keys:
+        _purge_in_background(keys)
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _discard_purges(session, previous_transaction) -> None:
+    """Forget the purges of a rolled back transaction."""
+    session.info.pop(PENDING_PURGES, None)
+
+
+def init_cdn_purge(app, hooks: List[Callable[[List[str]], None]]) -> None:
+    """Attach the purge backend to the app and register its hook."""
+    app.extensions["cdn_purge"] = create_purge_backend()
+    if (
+        Config.CDN_PURGE_BACKEND != "none"
+        and purge_after_invalidation not in hooks
+    ):
+        hooks.append(purge_after_invalidation)
+
+
+class _PurgeRecorder(BaseHTTPRequestHandler):
+    """Handler of the local purge server, recording the purged keys."""
+
+    def _record(self):
+        keys = self.headers.get("Surrogate-Key", "").split()
+        self.server.purged.append(keys)
+        logging.info("Purged surrogate keys: %s", " ".join(keys))
+        body = json.dumps({"status": "ok", "keys": keys}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_PURGE = do_POST = _record
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalPurgeServer(ThreadingHTTPServer):
+    """
+    Local HTTP stand-in for the CDN purge API, used in development.
+
+    Attributes:
+        purged (List[List[str]]): Surrogate keys of every purge received
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _PurgeRecorder)
+        self.purged: List[List[str]] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
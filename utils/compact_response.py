@@ -0,0 +1,88 @@
+"""Compact, precompressed representation of cached responses."""
+
+import gzip
+from typing import Any, NamedTuple, Tuple
+
+import brotli
+from flask import Response, make_response, request
+
+from app.extensions import minify
+
+# Response headers kept in a cached entry (HTMX headers are kept as well)
+CACHED_HEADERS = {"content-type"}
+
+# Compression levels of the cached bodies: the highest ones (gzip 9,
+# brotli 11) make every fill many times slower for bodies a few percent
+# smaller
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class CompactResponse(NamedTuple):
+    """Status, selected headers and compressed body of a rendered response."""
+
+    status: int
+    headers: Tuple[Tuple[str, str], ...]
+    gzip_body: bytes
+    br_body: bytes
+
+    @property
+    def size(self) -> int:
+        """Bytes of the compressed bodies, as stored in the cache."""
+        return len(self.gzip_body) + len(self.br_body)
+
+
+def _is_cached_header(name: str) -> bool:
+    """Whether a response header is stored in the cached entry."""
+    name = name.lower()
+    return name in CACHED_HEADERS or name.startswith("hx-")
+
+
+def pack_response(value: Any) -> Any:
+    """
+    Turn a rendered view result into a `CompactResponse`.
+
+    The body is minified the way the `after_request` minifier would, then
+    compressed once with gzip and brotli. Any other value (e.g. the dict
+    model of a page) is returned untouched.
+    """
+    if isinstance(value, str):
+        value = make_response(value)
+    if not isinstance(value, Response) or value.direct_passthrough:
+        return value
+
+    minify.main(value)
+    body = value.get_data()
+    return CompactResponse(
+        status=value.status_code,
+        headers=tuple(
+            (name, header)
+            for name, header in value.headers.items()
+            if _is_cached_header(name)
+        ),
+        gzip_body=gzip.compress(body, compresslevel=GZIP_LEVEL),
+        br_body=brotli.compress(body, quality=BROTLI_QUALITY),
+    )
+
+
+def unpack_response(value: Any) -> Any:
+    """
+    Build the response of a cached value for the current request.
+
+    The precompressed body matching the `Accept-Encoding` of the request is
+    served as is, clients accepting neither get the decompressed body.
+    """
+    if not isinstance(value, CompactResponse):
+        return value
+
+    resp = Response(status=value.status, headers=list(value.headers))
+    resp.vary.add("Accept-Encoding")
+    if "br" in request.accept_encodings:
+        resp.set_data(value.br_body)
+        resp.content_encoding = "br"
+    elif "gzip" in request.accept_encodings:
+        resp.set_data(value.gzip_body)
+        resp.content_encoding = "gzip"
+    else:
+        resp.set_data(gzip.decompress(value.gzip_body))
+    return resp
@@ -1,25 +1,354 @@
 """DB utility functions for querying and paginating SQLAlchemy models."""
 
-from typing import Any, Dict
+import logging
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from sqlalchemy import text
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import (
+    event,
+    func,
+    literal,
+    literal_column,
+    or_,
+    text,
+    tuple_,
+)
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql import operators
 
 from app.extensions import db
+from config import Config
+from utils.cache_mgr import get_cache_redis
+
+# Salt of the serializer signing pagination cursors
+CURSOR_SALT = "pagination-cursor"
+
+# Words of a search term (letters and digits, in any script)
+SEARCH_WORD = re.compile(r"[^\W_]+")
+
+# Characters with a special meaning in LIKE patterns
+LIKE_SPECIAL = re.compile(r"([%_\\])")
+
+# How `paginate_query` computes `total_items`
+COUNT_STRATEGIES = ("exact", "cached", "estimate", "none")
+
+# Increments a cached row count only if it is currently cached
+INCR_IF_EXISTS = """
+if redis.call('exists', KEYS[1]) == 1 then
+    return redis.call('incrby', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+@contextmanager
+def count_queries() -> Iterator[List[str]]:
+    """
+    Record the SQL statements executed on the engine inside the block.
+
+    Statements from every thread are recorded, which makes it usable around
+    concurrent requests as well.
+
+    Example:
+        ```
+        with count_queries() as statements:
+            client.get("/knowledge-hub")
+        print(len(statements))
+        ```
+    """
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@contextmanager
+def expect_queries(expected: int) -> Iterator[List[str]]:
+    """
+    Assert that the block runs exactly `expected` SQL statements.
+
+    Example:
+        ```
+        with expect_queries(2):
+            client.get("/knowledge-hub?q=courses", headers={"hx-tab": "1"})
+        ```
+
+    Raises:
+        AssertionError: Listing the statements, if their number differs
+    """
+    with count_queries() as statements:
+        yield statements
+    if len(statements) != expected:
+        raise AssertionError(
+            f"{len(statements)} queries instead of {expected}:\n"
+            + "\n".join(statements)
+        )
+
+
+@contextmanager
+def capture_queries() -> Iterator[List[Tuple[str, Any]]]:
+    """
+    Record the SQL statements executed inside the block, with their
+    parameters, so they can be replayed (e.g. by `explain`).
+    """
+    queries: List[Tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        queries.append((statement, parameters))
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def explain(statement: str, parameters: Any = None) -> Dict[str, Any]:
+    """
+    Plan PostgreSQL picks for a statement, from `EXPLAIN (FORMAT JSON)`.
+
+    Runs on the connection of the session, so it sees the rows written in
+    the current transaction.
+    """
+    result = db.session.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+    )
+    return result.scalar()[0]["Plan"]
+
+
+def seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """Tables read with a sequential scan anywhere in a query plan."""
+    tables = []
+    if plan.get("Node Type") == "Seq Scan":
+        tables.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        tables.extend(seq_scans(child))
+    return tables
+
+
+def count_key(model) -> str:
+    """Redis key caching the number of live rows of a model."""
+    return f"{Config.CACHE_KEY_PREFIX}count:{model.__tablename__}"
+
+
+def cached_count(model) -> int:
+    """
+    Number of live (not soft-deleted) rows of a model, cached in Redis.
+
+    The counter is seeded with an exact COUNT, then kept up to date by the
+    create/delete/restore hooks of `BaseModel`; its TTL bounds the drift
+    left by writes that bypass them.
+    """
+    if Config.CACHE_TYPE != "redis":
+        return model.query.filter_by(deleted_at=None).count()
+
+    redis_conn = get_cache_redis()
+    key = count_key(model)
+    value = redis_conn.get(key)
+    if value is None:
+        value = model.query.filter_by(deleted_at=None).count()
+        redis_conn.set(key, value, ex=Config.COUNT_CACHE_TIMEOUT, nx=True)
+    return int(value)
+
+
+def adjust_cached_count(model, delta: int) -> None:
+    """Add `delta` to the cached row count of a model, if it is cached."""
+    if Config.CACHE_TYPE != "redis":
+        return
+    try:
+        get_cache_redis().eval(INCR_IF_EXISTS, 1, count_key(model), delta)
+    except Exception as e:
+        logging.warning("Failed to adjust the row count of %s: %s", model, e)
+
+
+def estimated_count(model) -> Optional[int]:
+    """
+    Row count of a model's table estimated by PostgreSQL statistics.
+
+    Reads `pg_class.reltuples`, kept fresh by autovacuum/ANALYZE. It counts
+    every row, soft-deleted ones included, regardless of any filter.
+
+    Returns:
+        The estimate, or None when the table was never analyzed
+    """
+    estimate = db.session.execute(
+        text(
+            "SELECT reltuples::bigint FROM pg_class "
+            "WHERE oid = CAST(:table AS regclass)"
+        ),
+        {"table": model.__tablename__},
+    ).scalar()
+    return estimate if estimate is not None and estimate >= 0 else None
+
+
+def _cursor_serializer() -> URLSafeSerializer:
+    """Serializer turning cursor positions into opaque, signed strings."""
+    return URLSafeSerializer(Config.SECRET_KEY, salt=CURSOR_SALT)
+
+
+def encode_cursor(value: Any, uuid: str, backwards: bool = False) -> str:
+    """
+    Encode the position of a row in a keyset-paginated listing.
+
+    Args:
+        value: Value of the sort key of the row
+        uuid: UUID of the row, breaking ties between equal sort keys
+        backwards: Whether the cursor walks towards the previous page
+    """
+    if isinstance(value, datetime):
+        value = {"datetime": value.isoformat()}
+    return _cursor_serializer().dumps([value, uuid, backwards])
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[Any, str, bool]]:
+    """
+    Decode a cursor made by `encode_cursor`.
+
+    Returns:
+        The sort key value, UUID and direction of the cursor, or None for an
+        empty or invalid cursor (which starts from the first page)
+    """
+    if not cursor:
+        return None
+    try:
+        value, uuid, backwards = _cursor_serializer().loads(cursor)
+    except (BadSignature, TypeError, ValueError):
+        return None
+    if isinstance(value, dict) and "datetime" in value:
+        value = datetime.fromisoformat(value["datetime"])
+    return value, uuid, bool(backwards)
+
+
+def _sort_key(sort) -> Tuple[Any, bool]:
+    """
+    Split a sort specification into its key expression and direction.
+
+    Accepts the raw SQL strings used across the services (e.g.
+    `COALESCE(date_of_completion, created_at) DESC`) as well as SQLAlchemy
+    expressions (e.g. `Model.created_at.desc()`).
+
+    Returns:
+        The sort key expression and whether it is sorted descending
+    """
+    if isinstance(sort, str):
+        expression, _, direction = sort.strip().rpartition(" ")
+        if direction.upper() in ("ASC", "DESC"):
+            return literal_column(expression), direction.upper() == "DESC"
+        return literal_column(sort.strip()), False
+
+    modifier = getattr(sort, "modifier", None)
+    if modifier in (operators.asc_op, operators.desc_op):
+        return sort.element, modifier is operators.desc_op
+    return sort, False
+
+
+def _keyset_paginate(
+    query, model, sort, page_size: int, cursor: str
+) -> Dict[str, Any]:
+    """
+    Fetch one page of `query` after (or before) a cursor.
+
+    Rows are ordered by the sort key then `uuid`, and the page starts with
+    a row-value comparison on both, so every page costs an index range scan
+    of `page_size` rows, however deep it is.
+    """
+    key, descending = _sort_key(sort)
+    position = decode_cursor(cursor)
+    backwards = bool(position and position[2])
+
+    # Walking backwards reads the rows before the cursor in reverse order
+    reverse = descending != backwards
+    if position:
+        value, uuid, _ = position
+        row = tuple_(key, model.uuid)
+        after = tuple_(literal(value), literal(uuid, model.uuid.type))
+        query = query.filter(row < after if reverse else row > after)
+    query = query.order_by(
+        *((key.desc(), model.uuid.desc()) if reverse else (key, model.uuid))
+    )
+
+    rows = query.add_columns(key.label("sort_key")).limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+
+    next_cursor = prev_cursor = None
+    if rows:
+        first, last = rows[0], rows[-1]
+        if has_more or backwards:
+            next_cursor = encode_cursor(last.sort_key, last[0].uuid)
+        if (has_more and backwards) or (position and not backwards):
+            prev_cursor = encode_cursor(
+                first.sort_key, first[0].uuid, backwards=True
+            )
+
+    return dict(
+        data=[
+            item.to_dict() if hasattr(item, "to_dict") else item
+            for item, _ in rows
+        ],
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        page_size=page_size,
+    )
 
 
 def paginate_query(
-    model, page: int = 1, page_size: int = 10, **filters
+    model,
+    page: int = 1,
+    page_size: int = 10,
+    cursor: Optional[str] = None,
+    count: str = "exact",
+    columns: Optional[List[str]] = None,
+    criteria: Optional[List[Any]] = None,
+    options: Optional[List[Any]] = None,
+    **filters,
 ) -> Dict[str, Any]:
     """
     Execute a paginated query with filters.
 
+    Pages are fetched with OFFSET and counted, unless a `cursor` is given
+    (an empty string for the first page): the keyset mode then seeks the
+    page from the sort key of the previous one, and skips the count.
+
     Args:
         model: The SQLAlchemy model to query
         page: Page number (1-indexed)
         page_size: Number of items per page
+        cursor: `next_cursor` / `prev_cursor` of a previous keyset page
+        count: How `total_items` is computed:
+            - exact: a COUNT(*) of the query
+            - cached: the Redis counter of `cached_count` (exact COUNT when
+              filtering on more than `deleted_at`)
+            - estimate: the planner statistics of `estimated_count`
+            - none: no count, `total_items` is the number of items up to
+              this page (plus one if there is a next page)
+          `next_page` is always exact, and `total_items` never less than
+          the items seen so far.
+        columns: Names of the columns to load, for views showing a few
+          fields of each item. The primary key is always loaded, and the
+          deferred columns of the model only when listed. Items hold the
+          loaded columns only.
+        criteria: SQL expressions the items must also match (e.g. from
+          `json_contains`)
+        options: Loader options of the query (e.g. `with_expression` of the
+          card excerpts, which the items then hold)
         **filters: Filter conditions to apply to the query
             Special filters:
-            - sort: Field to sort by (can be a SQLAlchemy order_by expression)
+            - sort: Field to sort by (can be a SQLAlchemy order_by expression),
+              in keyset mode it must be a single non-null key
 
     Returns:
         Dictionary containing:
@@ -28,6 +357,11 @@ def paginate_query(
         - next_page: Next page number if more results exist, otherwise None
         - total_pages: Total number of pages
         - total_items: Total number of items matching the query
+        In keyset mode, `page`, `next_page`, `total_pages` and `total_items`
+        are replaced by:
+        - next_cursor: Cursor of the next page if more results exist
+        - prev_cursor: Cursor of the previous page, None on the first page
+        - page_size: Number of items per page
     """
     sort = filters.pop("sort", "updated_at DESC")
 
@@ -35,6 +369,20 @@ def paginate_query(
     filters.setdefault("deleted_at", None)
 
     query = model.query.filter_by(**filters)
+    if criteria:
+        query = query.filter(*criteria)
+    if options:
+        query = query.options(*options)
+    if columns is not None:
+        query = query.options(
+            load_only(*(getattr(model, name) for name in columns))
+        )
+
+    if cursor is not None:
+        return _keyset_paginate(query, model, sort, page_size, cursor)
+
+    if count not in COUNT_STRATEGIES:
+        raise ValueError(f"Invalid count strategy: {count}")
 
     # Apply sorting if specified
     if sort:
@@ -43,18 +391,39 @@ def paginate_query(
         else:
             query = query.order_by(sort)
 
-    pagination = query.paginate(page=page, per_page=page_size)
+    if count == "exact":
+        pagination = query.paginate(page=page, per_page=page_size)
+        rows, total_items = pagination.items, pagination.total
+        has_next = page * page_size < total_items
+    else:
+        # One extra row tells whether a next page exists
+        rows = query.offset((page - 1) * page_size).limit(page_size + 1).all()
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if (
+            count == "cached"
+            and filters == {"deleted_at": None}
+            and not criteria
+        ):
+            total_items = cached_count(model)
+        elif count == "cached":
+            total_items = query.order_by(None).count()
+        elif count == "estimate":
+            total_items = estimated_count(model)
+        else:
+            total_items = None
+        seen = (page - 1) * page_size + len(rows) + int(has_next)
+        total_items = max(total_items or 0, seen)
 
     items = [
-        item.to_dict() if hasattr(item, "to_dict") else item
-        for item in pagination.items
+        item.to_dict() if hasattr(item, "to_dict") else item for item in rows
     ]
 
-    total_items = pagination.total
     total_pages = (
         (total_items + page_size - 1) // page_size if total_items > 0 else 0
     )
-    next_page = page + 1 if page < total_pages else None
+    next_page = page + 1 if has_next else None
 
     return dict(
         data=items,
@@ -65,41 +434,165 @@ def paginate_query(
     )
 
 
-def search_by_multilang_field(
-    model, field_name: str, search_term: str
-) -> Dict[str, Any]:
+def json_contains(model, **fragments: Any) -> List[Any]:
     """
-    Search for items where a multilingual field contains the search term.
+    Criteria matching the rows whose JSON fields contain JSON fragments.
+
+    Each criterion is a containment (`@>`) of the whole JSONB field, served
+    by the `jsonb_path_ops` GIN index of the field (see
+    `app.models.search.containment_indexes`).
+
+    Args:
+        model: The SQLAlchemy model to filter
+        **fragments: JSON fragment each field must contain, by field name
+
+    Example:
+        ```
+        # Courses named "Python" and tagged "ai" in English
+        json_contains(Course, course_name={"en": "Python"},
+                      tags={"en": ["ai"]})
+        ```
+    """
+    return [
+        getattr(model, field).contains(fragment)
+        for field, fragment in fragments.items()
+    ]
+
+
+def json_values(
+    model, field: str, locale: str, array: bool = False
+) -> List[str]:
+    """
+    Distinct values of a multilingual JSON field over the live rows.
 
     Args:
         model: The SQLAlchemy model to query
-        field_name: Name of the JSONB field to search in
-        search_term: The search term to look for
+        field: Name of the multilingual JSON column
+        locale: Key of the values to list (`en` or `ar`)
+        array: Whether the field holds a list of values (e.g. tags) per
+               locale, rather than a single value
 
     Returns:
-        Dictionary containing search results and pagination metadata
+        The values, sorted
     """
-    field = getattr(model, field_name)
+    value = getattr(model, field)[locale]
+    value = func.jsonb_array_elements_text(value) if array else value.astext
+    rows = (
+        db.session.query(value.label("value"))
+        .filter(model.deleted_at.is_(None))
+        .distinct()
+        .order_by("value")
+    )
+    return [row.value for row in rows if row.value is not None]
 
-    result = model.query.filter(
-        model.deleted_at.is_(None),
-        (
-            db.cast(field["en"], db.String).ilike(f"%{search_term}%")
-            | db.cast(field["ar"], db.String).ilike(f"%{search_term}%")
-        ),
-    ).all()
 
-    res = [item.to_dict() for item in result if item]
+def full_text_search(
+    model, search_term: str, page: int = 1, page_size: int = 10, **filters
+) -> Dict[str, Any]:
+    """
+    Ranked full-text search over the search vectors of a model.
+
+    Every word of `search_term` is matched as a prefix, in English and in
+    Arabic, against the generated `search_en` / `search_ar` columns (see
+    `app.models.search`), using their GIN indexes. An empty search term
+    lists the model like `paginate_query`.
+
+    Args:
+        model: The SQLAlchemy model to search, with search vectors
+        search_term: The words to look for
+        page: Page number (1-indexed)
+        page_size: Number of items per page
+        **filters: Filter conditions to apply to the query
+
+    Returns:
+        Dictionary containing search results, best matches first, and
+        pagination metadata (same shape as `paginate_query`)
+    """
+    words = SEARCH_WORD.findall(search_term or "")
+    if not words:
+        return paginate_query(model, page=page, page_size=page_size, **filters)
+
+    tsquery = " & ".join(f"{word}:*" for word in words)
+    matches, ranks = [], []
+    for locale, config in Config.SEARCH_CONFIGS.items():
+        vector = getattr(model, f"search_{locale}")
+        query = func.to_tsquery(config, tsquery)
+        matches.append(vector.op("@@")(query))
+        ranks.append(func.ts_rank_cd(vector, query))
 
-    # Prepare pagination metadata
-    pagination_info = {
-        "total_pages": 1,
-        "page": 1,
-        "next_page": None,
-        "total_items": len(res),
-    }
+    filters.setdefault("deleted_at", None)
+    pagination = (
+        model.query.filter_by(**filters)
+        .filter(or_(*matches))
+        .order_by(func.greatest(*ranks).desc(), model.uuid)
+        .paginate(page=page, per_page=page_size, error_out=False)
+    )
+
+    return dict(
+        data=[item.to_dict() for item in pagination.items],
+        page=page,
+        next_page=page + 1 if pagination.has_next else None,
+        total_pages=pagination.pages,
+        total_items=pagination.total,
+    )
 
-    result = {"data": res}
-    result.update(pagination_info)
 
-    return result
+def substring_search(
+    model,
+    fields: List[str],
+    search_term: str,
+    page: int = 1,
+    page_size: int = 10,
+    **filters,
+) -> Dict[str, Any]:
+    """
+    Substring search over the per-locale text of multilingual JSON fields.
+
+    Meant for search boxes filtering as the user types: `search_term` may
+    be any part of a word. The `ILIKE '%term%'` matches use the trigram
+    GIN indexes of the fields (see `app.models.search.trigram_indexes`),
+    and the closest matches, by `word_similarity`, come first. An empty
+    search term lists the model like `paginate_query`.
+
+    Args:
+        model: The SQLAlchemy model to search, with trigram indexes
+        fields: Names of the multilingual JSON columns to search
+        search_term: The text to look for
+        page: Page number (1-indexed)
+        page_size: Number of items per page
+        **filters: Filter conditions to apply to the query
+
+    Returns:
+        Dictionary containing search results and pagination metadata (same
+        shape as `paginate_query`)
+    """
+    term = (search_term or "").strip()
+    if not term:
+        return paginate_query(model, page=page, page_size=page_size, **filters)
+
+    pattern = "%" + LIKE_SPECIAL.sub(r"\\\1", term) + "%"
+    matches, similarities = [], []
+    for field in fields:
+        for locale in Config.SEARCH_CONFIGS:
+            # Same expression as the trigram index, for the planner to use it
+            value = getattr(model, field).op("->>", return_type=db.Text)(
+                literal_column(f"'{locale}'")
+            )
+            matches.append(value.ilike(pattern, escape="\\"))
+            similarities.append(func.word_similarity(term, value))
+
+    filters.setdefault("deleted_at", None)
+    pagination = (
+        model.query.filter_by(**filters)
+        .filter(or_(*matches))
+        .order_by(func.greatest(*similarities).desc(), model.uuid)
+        .paginate(page=page, per_page=page_size, error_out=False)
+    )
+
+    return dict(
+        data=[item.to_dict() for item in pagination.items],
+        page=page,
+        next_page=page + 1 if pagination.has_next else None,
+        total_pages=pagination.pages,
+        total_items=pagination.total,
+    )
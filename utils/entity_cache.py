@@ -0,0 +1,185 @@
+"""Write-through cache of single rows, msgpack-encoded in Redis."""
+
+import logging
+import os
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple, TypedDict
+
+import msgspec
+from sqlalchemy import event
+
+from app.extensions import db
+from config import Config
+from utils.cache_mgr import get_cache_redis
+
+# Key of the session info holding the rows to evict once committed
+PENDING_EVICTIONS = "entity_cache_evictions"
+
+# First byte of an eviction tombstone (0xc1 is never used by msgpack)
+TOMBSTONE = b"\xc1"
+
+# Sets a row read after a miss, unless the key changed since the miss
+FILL_IF_UNCHANGED = """
+if (redis.call('get', KEYS[1]) or '') == ARGV[1] then
+    return redis.call('set', KEYS[1], ARGV[2], 'EX', ARGV[3])
+end
+return nil
+"""
+
+msgpack_encoder = msgspec.msgpack.Encoder()
+
+
+def entity_key(model, uuid: str) -> str:
+    """Redis key caching a row of a model."""
+    return f"{Config.CACHE_KEY_PREFIX}entity:{model.__tablename__}:{uuid}"
+
+
+def entity_cache_enabled(model) -> bool:
+    """Whether the rows of `model` are cached."""
+    return Config.CACHE_TYPE == "redis" and model.entity_cache
+
+
+@lru_cache(maxsize=None)
+def _decoder(model) -> msgspec.msgpack.Decoder:
+    """
+    Decoder of the cached rows of a model.
+
+    msgpack has no date type, msgspec encodes dates as ISO 8601 strings:
+    typing the date and datetime columns decodes them back to `date` and
+    `datetime`, as the templates expect.
+    """
+    fields = {}
+    for column in model.__table__.columns:
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = None
+        fields[column.key] = (
+            Optional[python_type] if python_type in (date, datetime) else Any
+        )
+    row_type = TypedDict(f"{model.__name__}Row", fields, total=False)
+    return msgspec.msgpack.Decoder(row_type)
+
+
+def get_entity(model, uuid: str) -> Tuple[Optional[Dict[str, Any]], bytes]:
+    """
+    Cached row of a model.
+
+    Args:
+        model: The model class
+        uuid: The UUID of the row, in its canonical form
+
+    Returns:
+        The row (None on a miss), and the stamp of the miss to pass to
+        `fill_entity`: the tombstone left by the last eviction, if any
+    """
+    if not entity_cache_enabled(model):
+        return None, b""
+    try:
+        data = get_cache_redis().get(entity_key(model, uuid)) or b""
+        if not data or data.startswith(TOMBSTONE):
+            return None, data
+        return _decoder(model).decode(data), data
+    except Exception as e:
+        logging.warning("Failed to read cached %s %s: %s", model, uuid, e)
+        return None, b""
+
+
+def fill_entity(model, uuid: str, row: Dict[str, Any], stamp: bytes) -> None:
+    """
+    Cache a row read from the database after a miss.
+
+    The row is only stored if the key still holds what the miss saw: a
+    write-through or an eviction in between (which leaves a new tombstone)
+    means the row may be older than the database, and is dropped.
+
+    Args:
+        model: The model class
+        uuid: The UUID of the row, in its canonical form
+        row: The row, as serialized by `to_dict`
+        stamp: The stamp returned by `get_entity` for the miss
+    """
+    if not entity_cache_enabled(model):
+        return
+    try:
+        get_cache_redis().eval(
+            FILL_IF_UNCHANGED,
+            1,
+            entity_key(model, uuid),
+            stamp,
+            msgpack_encoder.encode(row),
+            Config.ENTITY_CACHE_TIMEOUT,
+        )
+    except Exception as e:
+        logging.warning("Failed to cache %s %s: %s", model, uuid, e)
+
+
+def cache_entity(model, uuid: str, row: Dict[str, Any]) -> None:
+    """
+    Write a committed row through to the cache of its model.
+
+    Args:
+        model: The model class
+        uuid: The UUID of the row, in its canonical form
+        row: The row, as serialized by `to_dict`
+    """
+    if not entity_cache_enabled(model):
+        return
+    try:
+        get_cache_redis().set(
+            entity_key(model, uuid),
+            msgpack_encoder.encode(row),
+            ex=Config.ENTITY_CACHE_TIMEOUT,
+        )
+    except Exception as e:
+        logging.warning("Failed to cache %s %s: %s", model, uuid, e)
+
+
+def evict_entities(model, uuids: Iterable[str]) -> None:
+    """
+    Replace cached rows of a model with short-lived tombstones.
+
+    Each tombstone is unique, so a read that missed before the eviction
+    cannot cache the row it loaded meanwhile (see `fill_entity`), for up to
+    `ENTITY_CACHE_TOMBSTONE_TIMEOUT` seconds.
+    """
+    if not entity_cache_enabled(model):
+        return
+    try:
+        with get_cache_redis().pipeline(transaction=False) as pipe:
+            for uuid in uuids:
+                pipe.set(
+                    entity_key(model, uuid),
+                    TOMBSTONE + os.urandom(8),
+                    ex=Config.ENTITY_CACHE_TOMBSTONE_TIMEOUT,
+                )
+            pipe.execute()
+    except Exception as e:
+        logging.warning("Failed to evict cached %s: %s", model, e)
+
+
+def evict_on_commit(model, uuids: Iterable[str]) -> None:
+    """
+    Drop cached rows of a model once the current transaction commits.
+
+    For statements left for the caller to commit: evicting earlier would
+    let a concurrent read cache the rows again, before they change.
+    """
+    if entity_cache_enabled(model):
+        db.session.info.setdefault(PENDING_EVICTIONS, []).append(
+            (model, list(uuids))
+        )
+
+
+@event.listens_for(db.session, "after_commit")
+def _evict_committed(session) -> None:
+    """Evict the rows changed by the committed transaction."""
+    for model, uuids in session.info.pop(PENDING_EVICTIONS, []):
+        evict_entities(model, uuids)
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _discard_evictions(session, previous_transaction) -> None:
+    """Forget the evictions of a rolled back transaction."""
+    session.info.pop(PENDING_EVICTIONS, None)
@@ -0,0 +1,112 @@
+"""HTTP caching helpers: validators and conditional GET handling."""
+
+import pickle  # nosec
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from flask import Response, after_this_request, current_app, request, session
+from werkzeug.http import is_resource_modified
+from xxhash import xxh64
+
+from app.extensions import get_locale
+from config import Config
+from utils.compact_response import CompactResponse
+
+
+def value_digest(value: Any) -> str:
+    """Hash of a cached view result, computed once at fill time."""
+    if isinstance(value, CompactResponse):
+        return xxh64(value.gzip_body).hexdigest()
+    return xxh64(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+def _updated_at(item: Any) -> Optional[datetime]:
+    """The `updated_at` of a serialized row, if any."""
+    if isinstance(item, dict):
+        updated_at = item.get("updated_at")
+        if isinstance(updated_at, datetime):
+            return updated_at
+    return None
+
+
+def value_last_modified(value: Any) -> Optional[float]:
+    """
+    Latest `updated_at` of the rows a view model was built from.
+
+    Looks at the model itself, its dict values (e.g. `project=...`) and the
+    items of its list values (e.g. the `data` of a paginated listing).
+    """
+    if not isinstance(value, dict):
+        return None
+
+    candidates = [_updated_at(value)]
+    for item in value.values():
+        if isinstance(item, dict):
+            candidates.append(_updated_at(item))
+        elif isinstance(item, list):
+            candidates.extend(_updated_at(row) for row in item)
+
+    dates = [
+        date if date.tzinfo else date.replace(tzinfo=timezone.utc)
+        for date in candidates
+        if date
+    ]
+    return max(dates).timestamp() if dates else None
+
+
+def request_etag(digest: str, personal: bool) -> str:
+    """
+    Weak ETag of a cached value for the current request.
+
+    The value alone does not identify the page: the endpoint (which picks
+    the template a cached model is rendered with) and the cache version
+    (changed by every deploy) go into every ETag, so a template change
+    never answers 304 with the previous page. Pages rendered per request
+    from a cached model also embed the locale and the session CSRF token,
+    both go into their ETag so a 304 never revives a page holding another
+    session's (or an expired) token.
+    """
+    parts = [digest, request.endpoint, Config.CACHE_VERSION]
+    if personal:
+        time_limit = current_app.config.get("WTF_CSRF_TIME_LIMIT", 3600)
+        window = (
+            int(datetime.now().timestamp() // max(time_limit // 2, 1))
+            if time_limit
+            else 0
+        )
+        parts += [get_locale(), session.get("csrf_token"), window]
+    return f'W/"{xxh64(":".join(map(str, parts))).hexdigest()}"'
+
+
+def conditional_response(
+    etag: str, last_modified: Optional[float], private: bool
+) -> Optional[Response]:
+    """
+    Answer the current request with a 304 when the client copy is current.
+
+    Otherwise the validators are attached to the response being built, and
+    None is returned. Either way clients must revalidate before reusing
+    their copy, and `private` responses are kept out of shared caches.
+    """
+    modified_at = (
+        datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+        if last_modified
+        else None
+    )
+
+    def set_validators(response: Response) -> Response:
+        response.headers["ETag"] = etag
+        if modified_at:
+            response.last_modified = modified_at
+        response.cache_control.no_cache = True
+        if private:
+            response.cache_control.private = True
+        return response
+
+    if request.method in ("GET", "HEAD") and not is_resource_modified(
+        request.environ, etag=etag, last_modified=modified_at
+    ):
+        return set_validators(Response(status=304))
+
+    after_this_request(set_validators)
+    return None
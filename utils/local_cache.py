@@ -0,0 +1,84 @@
+"""In-process LRU cache with a byte budget and a TTL."""
+
+import pickle  # nosec
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+
+class LocalCache:
+    """
+    A per-process LRU cache sitting in front of the shared Redis cache.
+
+    Values are kept pickled, so every hit returns a fresh copy that callers
+    (and `after_request` handlers) may mutate freely, and the byte budget
+    is measured on the real payload size.
+
+    Attributes:
+        max_bytes (int): Upper bound of the pickled payloads kept in memory.
+        timeout (int): Seconds an entry stays valid, a safety net for
+                       invalidation messages missed by this process.
+    """
+
+    def __init__(self, max_bytes: int, timeout: int):
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.size = 0
+        self._entries: "OrderedDict[str, Tuple[float, str, bytes]]" = (
+            OrderedDict()
+        )
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under `key`, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, _, payload = entry
+            if expires < monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+        return pickle.loads(payload)  # nosec
+
+    def set(self, key: str, tag: str, value: Any) -> None:
+        """Store `value` under `key`, evicting least recently used entries."""
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (monotonic() + self.timeout, tag, payload)
+            self._tags.setdefault(tag, set()).add(key)
+            self.size += len(payload)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop every entry stored under one of the given tags."""
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self.size = 0
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry, the lock must be held by the caller."""
+        _, tag, payload = self._entries.pop(key)
+        self.size -= len(payload)
+        keys = self._tags.get(tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
@@ -0,0 +1,227 @@
+"""Archive the rows soft-deleted past the retention, and delete their files."""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from threading import Thread
+from time import sleep
+from typing import Any, Callable, Dict, List
+
+from flask import Flask
+from sqlalchemy import Column, DateTime, Table, func, insert, literal, select
+
+from app.extensions import db
+from app.models import ARCHIVES
+from config import Config
+from utils.file_manager import create_file_manager
+
+# Task type of the purge on the queue worker
+PURGE_TASK = "purge_deleted"
+
+# Redis key electing the worker that enqueues the next purge
+PURGE_LOCK = f"{Config.CACHE_KEY_PREFIX}purge_scheduled"
+
+
+def stored_files(value: Any) -> List[str]:
+    """
+    Paths of the files a column value refers to.
+
+    A file column holds a path, a list of paths (research images) or a list
+    of blocks with an `image` path (project content and testimonials).
+    """
+    if isinstance(value, str):
+        return [value] if value else []
+    if isinstance(value, dict):
+        return stored_files(value.get("image"))
+    if isinstance(value, list):
+        return [path for item in value for path in stored_files(item)]
+    return []
+
+
+def _file_columns(table: Table) -> List[Column]:
+    """Columns of a table holding paths of uploaded files."""
+    return [column for column in table.columns if column.info.get("file")]
+
+
+def _cutoff(retention_days: int) -> datetime:
+    """Deletion time before which soft-deleted rows are purged."""
+    return datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+
+def purge_report(
+    retention_days: int = Config.PURGE_RETENTION_DAYS,
+) -> Dict[str, Dict[str, int]]:
+    """
+    What a purge would free, without changing anything.
+
+    Args:
+        retention_days: Days a soft-deleted row is kept in its table
+
+    Returns:
+        The rows, files and row bytes (as stored by PostgreSQL, before
+        TOAST compression) a purge would free, by table
+    """
+    cutoff = _cutoff(retention_days)
+    report = {}
+    for model in ARCHIVES:
+        table = model.__table__
+        expired = table.c.deleted_at < cutoff
+        rows, size = db.session.execute(
+            select(
+                func.count(),
+                func.coalesce(
+                    func.sum(func.pg_column_size(table.table_valued())), 0
+                ),
+            ).where(expired)
+        ).one()
+
+        files = 0
+        columns = _file_columns(table)
+        if rows and columns:
+            values = db.session.execute(
+                select(*columns)
+                .where(expired)
+                .execution_options(yield_per=Config.PURGE_BATCH_SIZE)
+            )
+            files = sum(
+                len(stored_files(value)) for row in values for value in row
+            )
+        report[table.name] = {"rows": rows, "files": files, "bytes": size}
+    return report
+
+
+def _purge_table(
+    model, archive: Table, cutoff: datetime, batch_size: int
+) -> Dict[str, int]:
+    """
+    Move the expired rows of a table to its archive, batch by batch.
+
+    Each batch is archived and deleted in one transaction, with the rows
+    locked (`SKIP LOCKED`, so concurrent purges share the work). The files
+    of a batch are deleted once it is committed: a failed batch keeps both
+    its rows and its files.
+    """
+    table = model.__table__
+    names = [column.name for column in archive.columns][:-1]
+    columns = _file_columns(table)
+    file_manager = create_file_manager(directory=table.name)
+    purged = {"rows": 0, "files": 0}
+
+    while True:
+        batch = db.session.execute(
+            select(table.c.uuid, *columns)
+            .where(table.c.deleted_at < cutoff)
+            .order_by(table.c.deleted_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not batch:
+            return purged
+
+        uuids = [row.uuid for row in batch]
+        archived_at = literal(datetime.now(timezone.utc), DateTime)
+        db.session.execute(
+            insert(archive).from_select(
+                [*names, "archived_at"],
+                select(*[table.c[name] for name in names], archived_at).where(
+                    table.c.uuid.in_(uuids)
+                ),
+            )
+        )
+        deleted = model.bulk_delete(table.c.uuid.in_(uuids))
+        if not deleted:  # the rows were deleted meanwhile
+            return purged
+        purged["rows"] += deleted
+
+        for path in (
+            path
+            for row in batch
+            for value in row[1:]
+            for path in stored_files(value)
+        ):
+            try:
+                purged["files"] += file_manager.delete_file(path)
+            except Exception as e:
+                logging.warning("Failed to delete file '%s': %s", path, e)
+
+
+def purge_deleted(
+    retention_days: int = Config.PURGE_RETENTION_DAYS,
+    batch_size: int = Config.PURGE_BATCH_SIZE,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Move the rows soft-deleted longer than the retention to the archive
+    tables, and delete their files.
+
+    The hot tables then only hold the live rows and the recently deleted
+    ones (still restorable), which keeps their indexes and scans small.
+
+    Args:
+        retention_days: Days a soft-deleted row is kept in its table
+        batch_size: Rows archived per transaction
+
+    Returns:
+        The rows archived and files deleted, by table
+    """
+    cutoff = _cutoff(retention_days)
+    try:
+        return {
+            model.__tablename__: _purge_table(
+                model, archive, cutoff, batch_size
+            )
+            for model, archive in ARCHIVES.items()
+        }
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def purge_processor(app: Flask) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Queue task processor purging the soft-deleted rows.
+
+    Args:
+        app: The Flask application, for its database session
+
+    Returns:
+        The processor, taking the task data (an optional `retention_days`)
+    """
+
+    def process(data: Dict[str, Any]) -> bool:
+        with app.app_context():
+            purged = purge_deleted(
+                data.get("retention_days", Config.PURGE_RETENTION_DAYS)
+            )
+        logging.info(
+            "Purged %d rows and %d files",
+            sum(table["rows"] for table in purged.values()),
+            sum(table["files"] for table in purged.values()),
+        )
+        return True
+
+    return process
+
+
+def schedule_purge(queue_service, interval: int = Config.PURGE_INTERVAL):
+    """
+    Enqueue a purge every `interval` seconds, in the background.
+
+    Every queue worker runs the schedule, a Redis key with the interval as
+    expiry elects the one that enqueues each purge.
+
+    Args:
+        queue_service: The `QueueService` of the worker
+        interval: Seconds between two purges
+    """
+
+    def run() -> None:
+        while True:
+            try:
+                if queue_service.redis_client.set(
+                    PURGE_LOCK, 1, nx=True, ex=interval
+                ):
+                    queue_service.enqueue_task(PURGE_TASK, {})
+            except Exception as e:
+                logging.error("Failed to schedule the purge: %s", e)
+            sleep(min(interval, 60))
+
+    Thread(target=run, daemon=True).start()
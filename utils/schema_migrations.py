@@ -0,0 +1,350 @@
+"""
+Hand-written schema migrations, as Alembic operations.
+
+The migration history is generated on each deployment (`make db_migrate`),
+and autogenerate cannot write these: they are run by `flask schema ...`,
+or called from the `upgrade()` / `downgrade()` of a revision with its `op`.
+"""
+
+from typing import List, Optional, Set, Type
+
+from alembic.operations import Operations
+from sqlalchemy import (
+    JSON,
+    Column,
+    ForeignKeyConstraint,
+    Index,
+    String,
+    Table,
+    inspect,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.engine import Inspector
+from sqlalchemy.types import TypeEngine
+
+from app.extensions import db
+
+
+def jsonb_columns(table: Table) -> List[Column]:
+    """Columns of a table the models store as JSONB."""
+    return [
+        column for column in table.columns if isinstance(column.type, JSONB)
+    ]
+
+
+def _inspector(op: Operations) -> Optional[Inspector]:
+    """
+    Inspector of the migrated database, None when only printing the SQL.
+
+    Without a database, the SQL is written for one matching the models.
+    """
+    context = op.get_context()
+    return None if context.as_sql else inspect(context.bind)
+
+
+def _existing_tables(inspector: Optional[Inspector]) -> List[Table]:
+    """
+    Tables of the models the database has.
+
+    A database may predate some of them, the migrations leave those to
+    `flask db upgrade`.
+    """
+    tables = db.metadata.sorted_tables
+    if inspector is None:
+        return tables
+    names = set(inspector.get_table_names())
+    return [table for table in tables if table.name in names]
+
+
+def _pending_columns(
+    inspector: Optional[Inspector],
+    columns: List[Column],
+    type_: Type[TypeEngine],
+    stored: bool,
+) -> List[Column]:
+    """
+    Columns among `columns` (of one table) left to convert.
+
+    Args:
+        inspector: Inspector of the database, None to keep every column
+        columns: Columns of the models to convert
+        type_: Type the models give the columns
+        stored: Whether the columns are converted to `type_` (upgrade), or
+                back from it (downgrade)
+
+    Returns:
+        The columns the database has, not stored as wanted yet
+    """
+    if inspector is None or not columns:
+        return columns
+    types = {
+        column["name"]: column["type"]
+        for column in inspector.get_columns(columns[0].table.name)
+    }
+    return [
+        column
+        for column in columns
+        if column.name in types
+        and isinstance(types[column.name], type_) != stored
+    ]
+
+
+def _search_columns(table: Table) -> List[Column]:
+    """Generated search vectors of a table (see `app.models.search`)."""
+    return [column for column in table.columns if column.info.get("search")]
+
+
+def _generated_columns(
+    inspector: Optional[Inspector], table: Table
+) -> List[str]:
+    """
+    Generated columns of a table in the database.
+
+    PostgreSQL cannot change the type of a column a generated column reads,
+    they all have to be dropped meanwhile, including the ones the models no
+    longer declare.
+    """
+    if inspector is None:
+        return [column.name for column in _search_columns(table)]
+    return [
+        column["name"]
+        for column in inspector.get_columns(table.name)
+        if column.get("computed")
+    ]
+
+
+def _dependent_indexes(
+    inspector: Optional[Inspector], table: Table, search: Set[str]
+) -> List[Index]:
+    """
+    Indexes to rebuild around a type change of the JSONB columns.
+
+    The search vectors are generated from the JSON columns and have to be
+    dropped first, their indexes with them. The containment indexes change
+    definition (a `::jsonb` cast is needed on JSON). PostgreSQL rebuilds
+    the other expression indexes (trigram) on its own. Only the indexes
+    the database has are rebuilt.
+
+    Args:
+        inspector: Inspector of the database, None to keep every index
+        table: The table of the models
+        search: Names of the search vectors re-added after the change
+    """
+    indexes = [
+        index
+        for index in table.indexes
+        if index.name.endswith("_contains")
+        or {column.name for column in index.columns} & search
+    ]
+    if inspector is None:
+        return indexes
+    names = {index["name"] for index in inspector.get_indexes(table.name)}
+    return [index for index in indexes if index.name in names]
+
+
+def _create_index(op: Operations, index: Index) -> None:
+    """Create an index as declared by the models."""
+    op.create_index(
+        index.name,
+        index.table.name,
+        [getattr(key, "name", key) for key in index.expressions],
+        unique=index.unique,
+        **index.dialect_kwargs,
+    )
+
+
+def _convert_json_columns(op: Operations, to_jsonb: bool) -> None:
+    """
+    Change the type of the JSONB columns of the models, table by table.
+
+    Only the tables and columns the database has are converted, the search
+    vectors are re-added if the database had them.
+    """
+    inspector = _inspector(op)
+    for table in _existing_tables(inspector):
+        columns = _pending_columns(
+            inspector, jsonb_columns(table), JSONB, to_jsonb
+        )
+        if not columns:
+            continue
+        generated = _generated_columns(inspector, table)
+        search = [
+            column
+            for column in _search_columns(table)
+            if column.name in generated
+        ]
+        indexes = _dependent_indexes(
+            inspector, table, {column.name for column in search}
+        )
+        for index in indexes:
+            op.drop_index(index.name, table_name=table.name)
+        for name in generated:
+            op.drop_column(table.name, name)
+
+        for column in columns:
+            op.alter_column(
+                table.name,
+                column.name,
+                type_=JSONB() if to_jsonb else JSON(),
+                existing_type=JSON() if to_jsonb else JSONB(),
+                existing_nullable=column.nullable,
+                postgresql_using=(
+                    f'"{column.name}"::{"jsonb" if to_jsonb else "json"}'
+                ),
+            )
+
+        for column in search:
+            op.add_column(table.name, column._copy())
+        for index in indexes:
+            if to_jsonb or not index.name.endswith("_contains"):
+                _create_index(op, index)
+                continue
+            # JSON has no operator class, index its cast to JSONB
+            (column,) = index.columns
+            op.create_index(
+                index.name,
+                table.name,
+                [text(f"(({column.name})::jsonb) jsonb_path_ops")],
+                postgresql_using="gin",
+            )
+
+
+def upgrade_jsonb(op: Operations) -> None:
+    """
+    Store the multilingual fields as JSONB instead of JSON.
+
+    JSON is stored as text and parsed again by every `->>` or `@>`, JSONB
+    is parsed once on write and takes GIN indexes. Arrays of JSON objects
+    (content blocks, testimonials) are left as they are, they are only
+    ever loaded whole.
+    """
+    _convert_json_columns(op, to_jsonb=True)
+
+
+def downgrade_jsonb(op: Operations) -> None:
+    """Store the multilingual fields as JSON again."""
+    _convert_json_columns(op, to_jsonb=False)
+
+
+def _uuid_columns(table: Table) -> List[Column]:
+    """Primary and foreign keys of a table the models store as `uuid`."""
+    return [
+        column for column in table.columns if isinstance(column.type, UUID)
+    ]
+
+
+def _foreign_key_name(constraint: ForeignKeyConstraint) -> str:
+    """Name of a foreign key, as PostgreSQL names it if the model does not."""
+    return constraint.name or (
+        f"{constraint.table.name}_{constraint.column_keys[0]}_fkey"
+    )
+
+
+def _existing_foreign_keys(
+    inspector: Optional[Inspector], tables: List[Table]
+) -> List[ForeignKeyConstraint]:
+    """Foreign keys of the models on UUID keys, that the database has."""
+    foreign_keys = [
+        constraint
+        for table in tables
+        for constraint in table.foreign_key_constraints
+        if any(isinstance(column.type, UUID) for column in constraint.columns)
+    ]
+    if inspector is None:
+        return foreign_keys
+    names = {
+        (table.name, constraint["name"])
+        for table in tables
+        for constraint in inspector.get_foreign_keys(table.name)
+    }
+    return [
+        constraint
+        for constraint in foreign_keys
+        if (constraint.table.name, _foreign_key_name(constraint)) in names
+    ]
+
+
+def _convert_uuid_columns(op: Operations, to_uuid: bool) -> None:
+    """
+    Change the type of every UUID key, foreign keys dropped meanwhile.
+
+    Only the tables and columns the database has are converted.
+    """
+    inspector = _inspector(op)
+    tables = _existing_tables(inspector)
+    foreign_keys = _existing_foreign_keys(inspector, tables)
+    columns = {
+        table.name: _pending_columns(
+            inspector, _uuid_columns(table), UUID, to_uuid
+        )
+        for table in tables
+    }
+    for constraint in foreign_keys:
+        op.drop_constraint(
+            _foreign_key_name(constraint),
+            constraint.table.name,
+            type_="foreignkey",
+        )
+
+    for table in tables:
+        for column in columns[table.name]:
+            op.alter_column(
+                table.name,
+                column.name,
+                type_=UUID(as_uuid=False) if to_uuid else String(36),
+                existing_type=String(36) if to_uuid else UUID(as_uuid=False),
+                existing_nullable=column.nullable,
+                postgresql_using=(
+                    f'"{column.name}"::{"uuid" if to_uuid else "varchar(36)"}'
+                ),
+            )
+
+    for constraint in foreign_keys:
+        op.create_foreign_key(
+            _foreign_key_name(constraint),
+            constraint.table.name,
+            constraint.referred_table.name,
+            list(constraint.column_keys),
+            [element.column.name for element in constraint.elements],
+            ondelete=constraint.ondelete,
+            onupdate=constraint.onupdate,
+        )
+
+
+def upgrade_uuid(op: Operations) -> None:
+    """
+    Store the UUID keys as native `uuid` instead of `varchar(36)`.
+
+    A `uuid` is 16 bytes against 37, which more than halves the primary
+    key, foreign key and listing indexes (`uuid` ends their keys), and
+    compares as two integers instead of a collated string.
+    """
+    _convert_uuid_columns(op, to_uuid=True)
+
+
+def downgrade_uuid(op: Operations) -> None:
+    """Store the UUID keys as `varchar(36)` again."""
+    _convert_uuid_columns(op, to_uuid=False)
+
+
+def stored_as(connection, type_: Type[TypeEngine]) -> bool:
+    """
+    Whether the database stores the columns of the models typed `type_`
+    (e.g. `JSONB`) with that type already. Tables and columns the database
+    does not have yet are left out.
+    """
+    inspector = inspect(connection)
+    return not any(
+        _pending_columns(
+            inspector,
+            [
+                column
+                for column in table.columns
+                if isinstance(column.type, type_)
+            ],
+            type_,
+            True,
+        )
+        for table in _existing_tables(inspector)
+    )
@@ -0,0 +1,125 @@
+"""Row serializers of the models, compiled once per model."""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import msgspec
+from sqlalchemy import ARRAY, JSON, Column
+
+# Encoder of serialized rows to JSON bytes (dates in ISO 8601)
+json_encoder = msgspec.json.Encoder()
+
+# Serializer of one row: (instance, locale, nested) -> dict
+RowSerializer = Callable[[Any, Optional[str], bool], Dict[str, Any]]
+
+
+def localize(value: Any, locale: str) -> Any:
+    """
+    Value of a multilingual field in `locale`, at any depth.
+
+    Same projection as `normailze_i18n`, without mutating `value`: a dict
+    with a `locale` key is replaced by its value, other dicts and lists
+    are projected item by item.
+    """
+    if isinstance(value, dict):
+        if locale in value:
+            return value[locale]
+        return {key: localize(item, locale) for key, item in value.items()}
+    if isinstance(value, list):
+        return [localize(item, locale) for item in value]
+    return value
+
+
+def compile_serializer(mapper) -> RowSerializer:
+    """
+    Generate the serializer of the rows of a mapped class.
+
+    The generated function reads the column values straight from the
+    instance `__dict__`, with one statement per column, instead of walking
+    `__table__.columns` with `getattr` for every row. Columns that were not
+    loaded (deferred or projected out) are left out, JSON and ARRAY columns
+    are projected with `localize` when a locale is given. Rows expired by a
+    commit are reloaded first, like `getattr` would. Query expressions
+    (e.g. card excerpts) are serialized only when the query loaded them.
+
+    Relationships are serialized only when already loaded (eagerly, see
+    `BaseService.loader_options`), so serializing never lazy loads. The
+    related rows are serialized without their own relationships, which
+    keeps back references from recursing.
+
+    Args:
+        mapper: The mapper of the class, once configured
+
+    Returns:
+        The serializer, called as
+        `serializer(instance, locale=None, nested=True)`
+    """
+    plain, localized = [], []
+    for prop in mapper.column_attrs:
+        column = prop.columns[0]
+        if getattr(column, "info", {}).get("search"):
+            continue
+        plain.append(
+            f"    if {prop.key!r} in d: row[{prop.key!r}] = d[{prop.key!r}]"
+        )
+        if isinstance(column.type, (JSON, ARRAY)):
+            localized.append(
+                f"    if {prop.key!r} in d: "
+                f"row[{prop.key!r}] = localize(d[{prop.key!r}], locale)"
+            )
+        else:
+            localized.append(plain[-1])
+    keys = frozenset(
+        prop.key
+        for prop in mapper.column_attrs
+        if isinstance(prop.columns[0], Column)
+    )
+
+    related = []
+    for rel in mapper.relationships:
+        value = (
+            f"[item.__serializer__(item, locale, False) for item in "
+            f"d[{rel.key!r}]]"
+            if rel.uselist
+            else f"d[{rel.key!r}] and d[{rel.key!r}].__serializer__("
+            f"d[{rel.key!r}], locale, False)"
+        )
+        related.append(
+            f"        if {rel.key!r} in d: row[{rel.key!r}] = {value}"
+        )
+
+    source = "\n".join(
+        [
+            "def serialize(obj, locale=None, nested=True):",
+            "    expired = obj._sa_instance_state.expired_attributes",
+            "    if expired:",
+            "        for key in expired & keys:",
+            "            getattr(obj, key)",
+            "    d = obj.__dict__",
+            "    row = {}",
+            "    if locale is None:",
+            *[f"    {line}" for line in plain],
+            "    else:",
+            *[f"    {line}" for line in localized],
+            "    if nested:",
+            *(related or ["        pass"]),
+            "    return row",
+        ]
+    )
+    namespace = {"localize": localize, "keys": keys}
+    exec(  # nosec - generated from the mapped column names only
+        compile(source, f"<serializer {mapper.class_.__name__}>", "exec"),
+        namespace,
+    )
+    return namespace["serialize"]
+
+
+def to_json(items: Iterable[Any], locale: Optional[str] = None) -> bytes:
+    """
+    Serialize model instances straight to a JSON array.
+
+    Args:
+        items: Instances of models deriving from `BaseModel`
+        locale: Project the multilingual fields to this locale
+    """
+    rows: List[Dict[str, Any]] = [item.to_dict(locale) for item in items]
+    return json_encoder.encode(rows)
@@ -1,11 +1,19 @@
 """Base service class with common functionality for all services."""
 
-from typing import Any, Dict, Optional, Type
+from typing import Any, Dict, List, Optional, Type
 
 from marshmallow import Schema, ValidationError
 from werkzeug.datastructures import FileStorage
 
-from utils.db_utils import paginate_query
+from app.models.base import parse_uuid
+from utils.db_utils import (
+    full_text_search,
+    json_contains,
+    json_values,
+    paginate_query,
+    substring_search,
+)
+from utils.entity_cache import fill_entity, get_entity
 from utils.file_manager import create_file_manager
 
 
@@ -29,6 +37,11 @@ class BaseService:
         schema (Marshmallow Schema): Schema used for data validation and serialization.
         page_size (int): Number of items to return per paginated request.
                          Defaults to 10 if not specified.
+        count_strategy (str): How listings count their total items, one of
+                              `exact`, `cached`, `estimate` or `none`
+                              (see `paginate_query`).
+        loader_options (Dict[str, List]): Loader options of each view, by
+                              view name (see `get_all`).
         file_manager (FileManager): Utility for handling file-related operations.
 
     Usage Example:
@@ -47,11 +60,16 @@ class BaseService:
         Subclasses should specify their specific model and schema classes.
     """
 
+    # e.g. {"cards": [with_expression(Project.excerpt, ...)]}: the cards of
+    # a listing show a computed excerpt instead of the deferred content
+    loader_options: Dict[str, List[Any]] = {}
+
     def __init__(
         self,
         model_class,
         schema_class: Type[Schema],
         page_size: int = 10,
+        count_strategy: str = "exact",
     ):
         """
         Initialize the base service.
@@ -60,10 +78,12 @@ class BaseService:
             model_class: The SQLAlchemy model class for this service
             schema_class: The Marshmallow schema class for validation
             page_size: Default page size for pagination (must be > 0)
+            count_strategy: How listings count their total items
         """
         self.model_class = model_class
         self.schema = schema_class()
         self.page_size = page_size if page_size > 0 else 10
+        self.count_strategy = count_strategy
 
         # Initialize file manager
         directory = getattr(model_class, "__tablename__", "default")
@@ -73,30 +93,149 @@ class BaseService:
         """
         Retrieve an entity by its UUID.
 
+        Models with `entity_cache` are read from the entity cache first,
+        the writes of `BaseModel` keep it up to date.
+
         Args:
             uuid: The UUID of the entity to retrieve
 
         Returns:
             Dictionary representation of the entity if found, otherwise None
         """
+        uuid = parse_uuid(uuid)
+        if not uuid:
+            return None
+        row, stamp = get_entity(self.model_class, uuid)
+        if row is not None:
+            return row
+
         entity = self.model_class.get_byuuid(uuid)
-        if entity:
-            return entity.to_dict()
-        return None
+        if not entity:
+            return None
+        row = entity.__serializer__(entity, None, False)
+        fill_entity(self.model_class, uuid, row, stamp)
+        return row
 
-    def get_all(self, page: int = 1, **filters) -> Dict[str, Any]:
+    def get_all(
+        self,
+        page: int = 1,
+        cursor: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        view: Optional[str] = None,
+        **filters,
+    ) -> Dict[str, Any]:
         """
         Retrieve all entities with search and pagination.
 
         Args:
             page: Page number to retrieve (default is 1)
+            cursor: Cursor of the page to retrieve, switching to keyset
+                    pagination ("" for the first page)
+            columns: Names of the columns the view shows (all but the
+                     deferred ones by default)
+            view: Name of the view, selecting its `loader_options`
             **filters: Additional filters to apply
 
         Returns:
             Dictionary with items and pagination metadata
         """
         return paginate_query(
-            self.model_class, page=page, page_size=self.page_size, **filters
+            self.model_class,
+            page=page,
+            page_size=self.page_size,
+            cursor=cursor,
+            count=self.count_strategy,
+            columns=columns,
+            options=self.loader_options.get(view),
+            **filters,
+        )
+
+    def filter_by_json(
+        self,
+        page: int = 1,
+        columns: Optional[List[str]] = None,
+        view: Optional[str] = None,
+        **fragments: Any,
+    ) -> Dict[str, Any]:
+        """
+        Retrieve the entities whose JSON fields contain JSON fragments.
+
+        Args:
+            page: Page number to retrieve (default is 1)
+            columns: Names of the columns the view shows (all but the
+                     deferred ones by default)
+            view: Name of the view, selecting its `loader_options`
+            **fragments: JSON fragment each field must contain, by field
+                         name (e.g. `tags={"en": ["ai"]}`)
+
+        Returns:
+            Dictionary with the matching items and pagination metadata
+        """
+        return paginate_query(
+            self.model_class,
+            page=page,
+            page_size=self.page_size,
+            count=self.count_strategy,
+            columns=columns,
+            criteria=json_contains(self.model_class, **fragments),
+            options=self.loader_options.get(view),
+        )
+
+    def json_values(
+        self, field: str, locale: str, array: bool = False
+    ) -> List[str]:
+        """
+        Distinct values of a multilingual field, for filter options.
+
+        Args:
+            field: Name of the multilingual JSON field
+            locale: Locale of the values
+            array: Whether the field holds a list of values per locale
+
+        Returns:
+            The values, sorted
+        """
+        return json_values(self.model_class, field, locale, array=array)
+
+    def search(self, search_term: str, page: int = 1) -> Dict[str, Any]:
+        """
+        Full-text search over the search vectors of the model.
+
+        Only models declaring search vectors (news) support it, the others
+        are searched with `substring_search`.
+
+        Args:
+            search_term: The words to look for (an empty term lists all)
+            page: Page number to retrieve (default is 1)
+
+        Returns:
+            Dictionary with the best matches first and pagination metadata
+        """
+        return full_text_search(
+            self.model_class, search_term, page=page, page_size=self.page_size
+        )
+
+    def substring_search(
+        self, fields: List[str], search_term: str, page: int = 1
+    ) -> Dict[str, Any]:
+        """
+        Substring search, for search boxes filtering as the user types.
+
+        Args:
+            fields: Names of the multilingual fields to search
+            search_term: Any part of the text to look for (an empty term
+                         lists all)
+            page: Page number to retrieve (default is 1)
+
+        Returns:
+            Dictionary with the closest matches first and pagination metadata
+        """
+        return substring_search(
+            self.model_class,
+            fields,
+            search_term,
+            page=page,
+            page_size=self.page_size,
         )
 
     def delete(self, uuid: str, permanent: bool = False) -> bool:
@@ -126,12 +265,66 @@ class BaseService:
         Returns:
             Dictionary representation of the restored entity if found, otherwise None
         """
-        entity = self.model_class.get_byuuid(uuid)
-        if entity and entity.deleted_at:
+        entity = self.model_class.get_byuuid(uuid, deleted=True)
+        if entity:
             entity.restore()
             return entity.to_dict()
         return None
 
+    def bulk_create(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """
+        Validate and create many entities in one transaction.
+
+        Args:
+            rows: The data of each entity, all with the same fields
+
+        Returns:
+            The UUIDs of the created entities
+
+        Raises:
+            ValidationError: If any row fails validation (nothing is created)
+        """
+        for row in rows:
+            self.validate_with_schema(row)
+        return self.model_class.bulk_create(rows)
+
+    def bulk_update(self, uuids: List[str], **values) -> int:
+        """
+        Set the same field values on many entities in one transaction.
+
+        Args:
+            uuids: The UUIDs of the entities to update
+            **values: The fields to set
+
+        Returns:
+            The number of entities updated
+        """
+        return self.model_class.bulk_update(uuids, **values)
+
+    def bulk_soft_delete(self, uuids: List[str]) -> int:
+        """
+        Soft-delete many entities in one transaction.
+
+        Args:
+            uuids: The UUIDs of the entities to delete
+
+        Returns:
+            The number of entities deleted
+        """
+        return self.model_class.bulk_soft_delete(uuids)
+
+    def bulk_restore(self, uuids: List[str]) -> int:
+        """
+        Restore many soft-deleted entities in one transaction.
+
+        Args:
+            uuids: The UUIDs of the entities to restore
+
+        Returns:
+            The number of entities restored
+        """
+        return self.model_class.bulk_restore(uuids)
+
     def validate_with_schema(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate data using the schema.